@@ -0,0 +1,79 @@
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+
+# Modules a CLI run may import, from the entry point down to the third-party SDKs
+MODULES = [
+    "config",
+    "research.coordinator",
+    "research.query_generator",
+    "research.web_searcher",
+    "research.search_backends",
+    "research.content_processor",
+    "research.research_refiner",
+    "research.report_generator",
+    "models.model_interface",
+    "models.providers",
+    "aiohttp",
+    "fireworks.client",
+    "openai",
+]
+
+
+def import_cost(module):
+    """
+    Cumulative import time of `module` in microseconds, measured in a fresh
+    interpreter with -X importtime, or None if the module cannot be imported.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        return None
+
+    # Lines look like "import time:       123 |       4567 | package.module"; the target is reported last
+    for line in reversed(result.stderr.splitlines()):
+        parts = [p.strip() for p in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1])
+    return None
+
+
+def command_time(args):
+    """Wall-clock seconds of running a command in a fresh interpreter."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable] + args, cwd=ROOT, capture_output=True)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure CLI cold-start time and import cost per module")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per measurement (median is reported)")
+    parser.add_argument("modules", nargs="*", help="Modules to measure (default: the CLI's components and SDKs)")
+    args = parser.parse_args()
+
+    print(f"Import cost per module (median of {args.runs} cold imports, cumulative incl. dependencies):")
+    for module in args.modules or MODULES:
+        samples = [import_cost(module) for _ in range(args.runs)]
+        if None in samples:
+            print(f"  {module:<32} not importable here")
+            continue
+        print(f"  {module:<32} {statistics.median(samples) / 1000:8.1f} ms")
+
+    print("\nCommand wall-clock (median):")
+    for label, command in [
+        ("python -c pass", ["-c", "pass"]),
+        ("main.py --help", ["main.py", "--help"]),
+    ]:
+        samples = [command_time(command) for _ in range(args.runs)]
+        print(f"  {label:<32} {statistics.median(samples) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
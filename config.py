@@ -13,7 +13,61 @@ DEFAULT_CONFIG = {
         }
     },
     "max_search_results": 10,
+    "search_backend": "arxiv",  # "arxiv" (remote API), "local" (SQLite FTS5 index) or "federated"
+    "arxiv_index_path": "data/arxiv_index.db",
+    "federated_backends": ["arxiv", "local"],  # Backends queried concurrently by "federated"
+    "backend_timeouts": {"arxiv": 15.0, "local": 2.0},  # Seconds before a backend is dropped
+    "arxiv_page_size": 50,  # Results per arXiv API request when paging
+    "arxiv_prefetch_pages": 2,  # Pages requested ahead while earlier ones are consumed
+    "arxiv_min_interval": 3.0,  # Seconds between arXiv API requests, as arXiv asks of clients
+    "search_categories": [],  # arXiv categories ("cs.LG") or archives ("cs") to restrict searches to
+    "search_date_from": None,  # Submission date bounds, "YYYY-MM-DD", inclusive
+    "search_date_to": None,
+    "search_field": "all",  # "all", "title", "abstract" or "author"
+    "search_sort": "relevance",  # "relevance", "submitted" or "updated" (newest first)
+    "http_search_endpoints": [],  # Generic JSON endpoints, see HTTPJSONBackend
+    "rrf_k": 60,  # Reciprocal-rank fusion constant
     "max_content_length": 15000,  # Characters per page to process
     "default_depth": 3,
-    "default_breadth": 3
+    "default_breadth": 3,
+    "beam_width": 1,  # Refined directions explored in parallel per iteration (1 = linear chain)
+    "speculative_fraction": None,  # e.g. 0.6: plan the next iteration once 60% of queries are done
+    "speculative_change_threshold": 0.3,  # Replan if late queries add this share of new learnings
+    "incremental_report": False,  # Update a report draft after each iteration; the final call only polishes it
+    "adaptive_depth": False,  # Stop early / narrow breadth when iterations stop finding new material
+    "novelty_stop_threshold": 0.15,  # Stop when an iteration's novelty gain falls below this
+    "novelty_shrink_threshold": 0.35,  # Reduce next iteration's breadth below this gain
+    "novelty_min_iterations": 2,  # Always run at least this many iterations
+    "memory_max_learnings": 8,  # Learnings kept in each branch's research memory, most relevant first
+    "memory_max_directions": 10,  # Explored directions remembered so the refiner does not revisit them
+    "memory_summary_lines": 4,  # Per-iteration digest lines kept before older ones are folded into a total
+    "memory_item_chars": 300,  # Longer learnings and directions are clipped in the rendered context
+    "yield_allocation": True,  # Share each iteration's papers across queries by expected yield; drop dead queries
+    "yield_pool_factor": 2,  # Hits scored per query, and most papers one query can get, as a multiple of breadth
+    "query_dedup_similarity": 0.6,  # Reject generated queries this similar to one already searched
+    "query_overgeneration": 2,  # Spare queries requested so rejected repeats can be replaced
+    "extraction_store_path": None,  # e.g. "data/extractions.db": reuse per-paper extractions across runs
+    "extraction_max_learnings": 12,  # Reused learnings kept per query, best query coverage first
+    "cassette_mode": None,  # "record" or "replay" (see models/cassette.py); set by main.py --record/--replay
+    "cassette_path": None,
+    "cassette_replay_speed": 0.0,  # 1 = recorded latencies, >1 faster, 0 = no waiting
+    "json_mode": True,  # Use the provider's JSON mode for structured LLM stages
+    "structured_max_repairs": 1,  # Follow-up turns asking only for missing or invalid fields
+    "llm_endpoints": [],  # Routing pool: [{"provider", "model_id", "weight", "name"}]; empty = the selected model only
+    "llm_stage_pins": {},  # {stage: endpoint name ("provider:model_id" unless named)} for stages needing one model
+    "llm_endpoint_ewma_alpha": 0.3,  # Weight of the newest call in the latency/error-rate averages
+    "llm_endpoint_cooldown": 30.0,  # Seconds an endpoint with a high error rate is only used as a last resort
+    "llm_endpoint_error_half_life": 60.0,  # Seconds for an endpoint's error rate to halve without new calls
+    "llm_endpoint_probe_interval": 20,  # Every Nth call goes to the endpoint idle longest (0 = never probe)
+    "llm_concurrency_initial": 4,  # Starting limit on concurrent LLM calls, shared process-wide
+    "llm_concurrency_min": 1,
+    "llm_concurrency_max": 16,  # AIMD grows the limit up to this while calls stay fast and error-free
+    "llm_latency_tolerance": 3.0,  # A call this many times slower than its stage's best latency backs off
+    "llm_max_retries": 3,  # Retries of 429/5xx/timeout responses, with jittered exponential backoff
+    "llm_stage_priorities": {},  # Overrides of models/concurrency.py DEFAULT_STAGE_PRIORITIES ("high"/"normal"/"low")
+    "pricing": {},  # Extra/override model prices in USD per million tokens, see models/usage_tracker.py
+    "budget_max_tokens": None,  # Optional per-run ceilings; the run degrades gracefully as they near
+    "budget_max_cost": None,
+    "budget_max_seconds": None,
+    "budget_report_reserve": 0.15  # Share of the budget kept back for the final report
 }
\ No newline at end of file
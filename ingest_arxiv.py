@@ -0,0 +1,38 @@
+import argparse
+import time
+from pathlib import Path
+from research.arxiv_index import ArxivIndex
+from config import DEFAULT_CONFIG
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or update the local arXiv search index")
+    parser.add_argument("dumps", nargs="+",
+                        help="Metadata dumps to ingest (.jsonl/.json Kaggle snapshots or OAI-PMH .xml)")
+    parser.add_argument("--index", default=DEFAULT_CONFIG["arxiv_index_path"],
+                        help="Path of the SQLite index to create or update")
+    parser.add_argument("--batch-size", type=int, default=5000,
+                        help="Records written per transaction")
+
+    args = parser.parse_args()
+
+    index = ArxivIndex(args.index)
+    print(f"Index: {args.index} ({index.count()} papers before ingest)")
+
+    for dump in args.dumps:
+        path = Path(dump)
+        start = time.time()
+        print(f"Ingesting {path}...")
+
+        if path.suffix == ".xml":
+            stats = index.ingest_oai_xml(path, args.batch_size)
+        else:
+            stats = index.ingest_jsonl(path, args.batch_size)
+
+        print(f"  inserted {stats['inserted']}, updated {stats['updated']}, "
+              f"skipped {stats['skipped']} in {time.time() - start:.1f}s")
+
+    print(f"Index now holds {index.count()} papers")
+    index.close()
+
+if __name__ == "__main__":
+    main()
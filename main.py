@@ -1,13 +1,7 @@
 import asyncio
 import argparse
+from datetime import date
 from pathlib import Path
-from research.coordinator import ResearchCoordinator
-from research.query_generator import QueryGenerator
-from research.web_searcher import WebSearcher
-from research.content_processor import ContentProcessor
-from research.research_refiner import ResearchRefiner
-from research.report_generator import ReportGenerator
-from models.model_interface import ModelInterface
 from config import DEFAULT_CONFIG
 
 async def main():
@@ -20,35 +14,142 @@ async def main():
     parser.add_argument("--model", choices=["scout", "maverick"], default="maverick",
                         help="LLama 4 model to use")
     parser.add_argument("--output", help="Output file for the report (markdown)")
+    parser.add_argument("--endpoint", action="append", metavar="PROVIDER:MODEL[@WEIGHT]",
+                        help="Add an LLM endpoint to the routing pool (repeatable); calls go to the fastest "
+                             "healthy endpoint and fail over to the others. Replaces --model when given.")
+    parser.add_argument("--pin", action="append", metavar="STAGE=PROVIDER:MODEL",
+                        help="Always send one stage (e.g. report_generation) to a specific endpoint")
+    parser.add_argument("--search-backend", choices=["arxiv", "local", "federated"],
+                        default=DEFAULT_CONFIG["search_backend"],
+                        help="Search the remote arXiv API, a local index built with ingest_arxiv.py, "
+                             "or both concurrently (federated)")
+    parser.add_argument("--index-path", default=DEFAULT_CONFIG["arxiv_index_path"],
+                        help="Path of the local arXiv index (with --search-backend local)")
+    parser.add_argument("--categories", help="Comma-separated arXiv categories or archives, e.g. cs.LG,cs.CL or cs")
+    parser.add_argument("--since", metavar="YYYY-MM-DD", type=iso_date, help="Only papers submitted on or after this date")
+    parser.add_argument("--until", metavar="YYYY-MM-DD", type=iso_date, help="Only papers submitted on or before this date")
+    parser.add_argument("--field", choices=["all", "title", "abstract", "author"], default=DEFAULT_CONFIG["search_field"],
+                        help="Record field the search terms are matched against")
+    parser.add_argument("--sort", choices=["relevance", "submitted", "updated"], default=DEFAULT_CONFIG["search_sort"],
+                        help="Order of search results (dates sort newest first)")
+    parser.add_argument("--beam-width", type=int, default=DEFAULT_CONFIG["beam_width"],
+                        help="Refined directions explored in parallel per iteration (1 = linear chain)")
+    parser.add_argument("--speculative", type=float, metavar="FRACTION",
+                        help="Start planning the next iteration once this fraction of queries has finished")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="Stop early or narrow breadth when iterations stop finding new material")
+    parser.add_argument("--even-allocation", action="store_true",
+                        help="Read the top BREADTH papers of every query instead of allocating papers by expected yield")
+    parser.add_argument("--budget-tokens", type=int, help="Maximum LLM tokens for the run")
+    parser.add_argument("--budget-dollars", type=float, help="Maximum LLM cost for the run in USD")
+    parser.add_argument("--budget-seconds", type=float, help="Maximum wall-clock time for the run")
+    parser.add_argument("--incremental-report", action="store_true",
+                        help="Update a report draft after every iteration (written to --output as it grows); "
+                             "the final step only polishes it")
+    parser.add_argument("--timeout", type=float,
+                        help="Cancel the run after this many seconds and output the partial report")
+    parser.add_argument("--extraction-store", metavar="PATH",
+                        help="SQLite store of per-paper extractions reused across runs (e.g. data/extractions.db)")
+    cassette = parser.add_mutually_exclusive_group()
+    cassette.add_argument("--record", metavar="CASSETTE",
+                          help="Record every LLM exchange and arXiv response to this cassette file")
+    cassette.add_argument("--replay", metavar="CASSETTE",
+                          help="Replay a recorded cassette instead of calling the LLM and arXiv (no network or API key)")
+    parser.add_argument("--replay-speed", type=float, default=DEFAULT_CONFIG["cassette_replay_speed"],
+                        help="With --replay: 1 reproduces the recorded latencies, 10 replays 10x faster, "
+                             "0 does not wait at all")
     
     args = parser.parse_args()
     
+    # Components are imported only once the arguments are valid, so --help and usage errors
+    # return immediately; the model provider SDK itself is loaded by ModelInterface on demand
+    from research.coordinator import ResearchCoordinator
+    from research.query_generator import QueryGenerator
+    from research.web_searcher import WebSearcher
+    from research.content_processor import ContentProcessor
+    from research.research_refiner import ResearchRefiner
+    from research.report_generator import ReportGenerator
+    from models.model_interface import ModelInterface
+    from models.cassette import open_cassette
+    
+    config = DEFAULT_CONFIG.copy()
+    config["search_backend"] = args.search_backend
+    config["arxiv_index_path"] = args.index_path
+    config["search_categories"] = args.categories.split(",") if args.categories else []
+    config["search_date_from"] = args.since
+    config["search_date_to"] = args.until
+    config["search_field"] = args.field
+    config["search_sort"] = args.sort
+    config["adaptive_depth"] = args.adaptive
+    config["beam_width"] = args.beam_width
+    config["speculative_fraction"] = args.speculative
+    config["budget_max_tokens"] = args.budget_tokens
+    config["budget_max_cost"] = args.budget_dollars
+    config["budget_max_seconds"] = args.budget_seconds
+    config["incremental_report"] = args.incremental_report
+    config["yield_allocation"] = not args.even_allocation
+    config["extraction_store_path"] = args.extraction_store
+    if args.endpoint:
+        config["llm_endpoints"] = [parse_endpoint(spec) for spec in args.endpoint]
+    if args.pin:
+        config["llm_stage_pins"] = dict(pin.split("=", 1) for pin in args.pin)
+    if args.record or args.replay:
+        config["cassette_mode"] = "record" if args.record else "replay"
+        config["cassette_path"] = args.record or args.replay
+        config["cassette_replay_speed"] = args.replay_speed
+    
     # Initialize model
     model_config = DEFAULT_CONFIG["models"][args.model]
-    model = ModelInterface(model_config["model_id"], DEFAULT_CONFIG)
+    model = ModelInterface(model_config["model_id"], config)
     
     # Initialize components
-    query_generator = QueryGenerator(model)
-    web_searcher = WebSearcher(DEFAULT_CONFIG)
-    content_processor = ContentProcessor(model, DEFAULT_CONFIG)
+    query_generator = QueryGenerator(model, config)
+    web_searcher = WebSearcher(config)
+    content_processor = ContentProcessor(model, config)
     research_refiner = ResearchRefiner(model)
     report_generator = ReportGenerator(model)
     
+    # Keep the latest draft on disk so a usable report exists even if the process is killed
+    def handle_event(event, data):
+        if event == "report_draft_updated" and args.output:
+            Path(args.output).write_text(data["report"])
+    
     # Create coordinator
     coordinator = ResearchCoordinator(
         query_generator,
         web_searcher,
         content_processor,
         research_refiner,
-        report_generator
+        report_generator,
+        config,
+        handle_event,
+        usage_tracker=model.usage
     )
     
     print(f"Starting research on: {args.query}")
-    print(f"Using model: Llama 4 {args.model.capitalize()}")
+    if config.get("llm_endpoints"):
+        print(f"Using endpoints: {', '.join(e.name for e in model.router.endpoints)}")
+    else:
+        print(f"Using model: Llama 4 {args.model.capitalize()}")
     print(f"Depth: {args.depth}, Breadth: {args.breadth}")
     
-    # Conduct research
-    report = await coordinator.conduct_research(args.query, args.depth, args.breadth)
+    # Conduct research; on timeout or Ctrl-C fall back to the report as far as it got
+    cassette = open_cassette(config)
+    try:
+        report = await asyncio.wait_for(
+            coordinator.conduct_research(args.query, args.depth, args.breadth), args.timeout
+        )
+    except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+        reason = f"timed out after {args.timeout:.0f}s" if isinstance(e, asyncio.TimeoutError) else "interrupted"
+        print(f"\nResearch {reason}; writing the partial report")
+        report = coordinator.partial_report()
+        if isinstance(e, asyncio.CancelledError):
+            asyncio.current_task().uncancel()
+    finally:
+        # Keep whatever was recorded, even from a failed or interrupted run
+        if cassette and not cassette.replaying:
+            cassette.save()
+            print(f"Recorded {cassette.describe()} to {cassette.path}")
     
     # Save or display report
     if args.output:
@@ -59,6 +160,57 @@ async def main():
         print("\n" + "="*80 + "\n")
         print(report)
         print("\n" + "="*80 + "\n")
+    
+    if coordinator.run_summary:
+        print_run_summary(coordinator.run_summary)
+    print(model.usage.format_summary())
+    print(f"  LLM concurrency: {model.limiter.describe()}")
+    if len(model.router.endpoints) > 1:
+        for line in model.router.describe():
+            print(f"  Endpoint {line}")
+
+def iso_date(value):
+    """argparse type for YYYY-MM-DD dates."""
+    try:
+        return date.fromisoformat(value).isoformat()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date '{value}', expected YYYY-MM-DD")
+
+def parse_endpoint(spec):
+    """Parse PROVIDER:MODEL[@WEIGHT] into an `llm_endpoints` entry."""
+    spec, _, weight = spec.partition("@")
+    provider, _, model_id = spec.partition(":")
+    if not model_id:
+        raise SystemExit(f"Invalid --endpoint '{spec}': expected PROVIDER:MODEL[@WEIGHT]")
+    return {"provider": provider, "model_id": model_id, "weight": float(weight or 1.0)}
+
+def print_run_summary(summary):
+    """Print how many iterations ran and the beam, speculation, adaptive-depth and budget decisions."""
+    print("Run summary:")
+    print(f"  Iterations: {summary['iterations_run']}/{summary['planned_depth']}")
+    
+    if summary["adaptive"]:
+        for gain in summary["novelty"]:
+            print(f"  Iteration {gain['iteration']}: novelty gain {gain['gain']:.2f} "
+                  f"(learnings {gain['learning_novelty']:.2f}, sources {gain['source_novelty']:.2f}) "
+                  f"-> {gain['decision']}")
+    
+    for level in summary.get("beam", []):
+        scores = ", ".join(f"{b}={score:.1f}" for b, score in level["branch_scores"].items())
+        print(f"  Beam after iteration {level['iteration']}: {scores}; "
+              f"continuing {', '.join(level['kept'])}, pruned {level['pruned']}")
+    
+    for plan in summary.get("speculation", []):
+        print(f"  Speculative plan after iteration {plan['iteration']}: {plan['outcome']} "
+              f"(late results changed {plan['late_change']:.0%} of learnings)")
+    
+    if "budget" in summary:
+        print(f"  Budget: {summary['budget']['limits']}")
+        for action in summary["budget"]["actions"]:
+            print(f"    {action}")
+    
+    if summary["stopped_early"]:
+        print(f"  Stopped early: {summary['stop_reason']}")
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,159 @@
+import asyncio
+import gzip
+import hashlib
+import json
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from models.providers import Provider
+
+
+class Cassette:
+    """
+    Recording of the external calls made during a run, for offline replay.
+
+    Every exchange is stored under the SHA-256 of its canonical request
+    (e.g. model, messages and sampling parameters, or an arXiv URL) together
+    with the response latency. Response payloads are content-addressed by
+    their own SHA-256, so identical responses are stored once. The file is
+    gzip-compressed JSON.
+
+    In replay mode, a request is answered with the recorded responses for
+    the same request key, in recording order, and the last one is reused if
+    the run repeats a request more often than it was recorded. Recorded
+    latencies are reproduced divided by `speed`; a speed of 0 replays
+    without waiting.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path, mode, speed=0.0):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+
+        self.path = Path(path)
+        self.mode = mode
+        self.speed = speed
+        self.blobs = {}  # payload hash -> payload
+        self.calls = {}  # kind -> request hash -> [{"blob": payload hash, "latency": seconds}]
+        self._positions = {}
+
+        if mode == "replay":
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != self.VERSION:
+                raise ValueError(f"Unsupported cassette version in {self.path}: {data.get('version')}")
+            self.blobs = data["blobs"]
+            self.calls = data["calls"]
+
+    @property
+    def replaying(self):
+        return self.mode == "replay"
+
+    @staticmethod
+    def digest(value):
+        canonical = json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    async def call(self, kind, request, live):
+        """
+        Return the payload for `request`: recorded from `live()` (an async callable
+        returning a JSON-serialisable payload) in record mode, or read back in replay mode.
+        """
+        key = self.digest(request)
+
+        if self.replaying:
+            recorded = self.calls.get(kind, {}).get(key)
+            if not recorded:
+                raise LookupError(f"No recorded {kind} response in {self.path} for request {key[:12]}")
+
+            position = self._positions.get((kind, key), 0)
+            self._positions[(kind, key)] = position + 1
+            entry = recorded[min(position, len(recorded) - 1)]
+
+            if self.speed > 0:
+                await asyncio.sleep(entry["latency"] / self.speed)
+            return self.blobs[entry["blob"]]
+
+        start = time.monotonic()
+        payload = await live()
+        latency = time.monotonic() - start
+
+        blob = self.digest(payload)
+        self.blobs[blob] = payload
+        self.calls.setdefault(kind, {}).setdefault(key, []).append({"blob": blob, "latency": round(latency, 3)})
+        return payload
+
+    def save(self):
+        """Write the recording; does nothing in replay mode."""
+        if self.replaying:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {"version": self.VERSION, "blobs": self.blobs, "calls": self.calls}
+        with gzip.open(self.path, "wt", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"), ensure_ascii=False)
+
+    def describe(self):
+        exchanges = sum(len(entries) for by_key in self.calls.values() for entries in by_key.values())
+        return f"{exchanges} exchanges, {len(self.blobs)} unique responses"
+
+
+# One cassette per path and mode, shared by every component of the process
+_CASSETTES = {}
+
+
+def open_cassette(config):
+    """The cassette selected by the `cassette_mode`/`cassette_path` config keys, or None."""
+    mode = config.get("cassette_mode")
+    if not mode:
+        return None
+
+    key = (str(config["cassette_path"]), mode)
+    if key not in _CASSETTES:
+        _CASSETTES[key] = Cassette(config["cassette_path"], mode, config.get("cassette_replay_speed", 0.0))
+    return _CASSETTES[key]
+
+
+class CassetteProvider(Provider):
+    """
+    Provider wrapper that records the wrapped provider's completions, or
+    replays them without creating (or importing) the real provider at all.
+    """
+
+    def __init__(self, config, cassette, provider_cls):
+        super().__init__(config)
+        self.cassette = cassette
+        self.inner = None if cassette.replaying else provider_cls(config)
+        self.name = provider_cls.name
+        self.supports_json_schema = provider_cls.supports_json_schema
+
+    async def create(self, messages, request):
+        payload = await self.cassette.call(
+            "llm",
+            {"provider": self.name, "messages": messages, "request": request},
+            lambda: self._live(messages, request)
+        )
+
+        usage = SimpleNamespace(
+            prompt_tokens=payload["usage"]["prompt_tokens"],
+            completion_tokens=payload["usage"]["completion_tokens"],
+            prompt_tokens_details=SimpleNamespace(cached_tokens=payload["usage"]["cached_tokens"])
+        )
+        message = SimpleNamespace(content=payload["content"])
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+
+    async def _live(self, messages, request):
+        response = await self.inner.create(messages, request)
+
+        usage = getattr(response, "usage", None)
+        details = getattr(usage, "prompt_tokens_details", None)
+        return {
+            "content": response.choices[0].message.content,
+            "usage": {
+                "prompt_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+                "completion_tokens": getattr(usage, "completion_tokens", 0) or 0,
+                "cached_tokens": (getattr(details, "cached_tokens", 0) or 0) if details is not None else 0
+            }
+        }
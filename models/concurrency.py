@@ -0,0 +1,144 @@
+import asyncio
+import heapq
+import itertools
+import random
+
+# Lower value = served first when calls are queued
+PRIORITY_CLASSES = {"high": 0, "normal": 1, "low": 2}
+
+# Default priority per usage-accounting stage; other stages are "normal"
+DEFAULT_STAGE_PRIORITIES = {
+    "report_generation": "high",
+    "report_polish": "high",
+    "report_update": "high",
+    "content_extraction": "low",
+    "paper_extraction": "low",
+}
+
+
+def is_overload_error(error):
+    """True for provider responses that mean "slow down": HTTP 429, 5xx and timeouts."""
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    if isinstance(status, int):
+        return status == 429 or status >= 500
+    return isinstance(error, asyncio.TimeoutError) or "timeout" in type(error).__name__.lower()
+
+
+def is_transport_error(error):
+    """True for failures to reach the provider at all: connection errors, resets and timeouts."""
+    if isinstance(error, (ConnectionError, asyncio.TimeoutError)):
+        return True
+    name = type(error).__name__.lower()
+    return "connect" in name or "timeout" in name
+
+
+class AdaptiveLimiter:
+    """
+    Process-wide limit on concurrent LLM calls, adjusted with AIMD.
+
+    Each successful call at normal latency raises the limit additively (about
+    +1 per limit's worth of calls). A 429/5xx/timeout halves it, and a call
+    whose latency exceeds `latency_tolerance` times the best latency seen for
+    its stage shrinks it by 10%, since queueing at the provider shows up as
+    latency before it shows up as errors. At most one decrease is applied per
+    round of in-flight calls, so a burst of failures from one overload only
+    backs off once.
+
+    Waiting calls are served by priority class ("high", "normal", "low"), then
+    in arrival order.
+    """
+
+    def __init__(self, initial=4, min_limit=1, max_limit=16, latency_tolerance=3.0):
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_tolerance = latency_tolerance
+
+        self.active = 0
+        self.overloads = 0
+        self.slow_calls = 0
+        self.peak_limit = self.limit
+        self._baselines = {}  # stage -> best recent latency
+        self._waiters = []  # heap of (priority, sequence, future)
+        self._sequence = itertools.count()
+        self._completed = 0
+        self._last_decrease = None
+
+    async def acquire(self, priority="normal"):
+        """Wait for a free slot; higher-priority waiters are admitted first."""
+        if self.active < int(self.limit) and not self._waiters:
+            self.active += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (PRIORITY_CLASSES.get(priority, 1), next(self._sequence), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._release_slot()  # Slot was handed over just as the waiter was cancelled
+            raise
+
+    def release(self, stage="other", latency=None, overloaded=False):
+        """Return a slot and feed the call's outcome into the limit."""
+        self._completed += 1
+
+        if overloaded:
+            self.overloads += 1
+            self._decrease(0.5)
+        elif latency is not None:
+            baseline = self._baselines.get(stage)
+            # The baseline drifts up slowly so one unusually fast call does not pin it forever
+            self._baselines[stage] = latency if baseline is None else min(latency, baseline * 1.05)
+            if baseline is not None and latency > self.latency_tolerance * baseline:
+                self.slow_calls += 1
+                self._decrease(0.9)
+            else:
+                self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+                self.peak_limit = max(self.peak_limit, self.limit)
+
+        self._release_slot()
+
+    def _decrease(self, factor):
+        # Calls completing within one round of the last decrease were already in flight then
+        if self._last_decrease is not None and self._completed - self._last_decrease <= int(self.limit):
+            return
+        self.limit = max(self.min_limit, self.limit * factor)
+        self._last_decrease = self._completed
+
+    def _release_slot(self):
+        self.active -= 1
+        while self._waiters and self.active < int(self.limit):
+            _, _, future = heapq.heappop(self._waiters)
+            if future.cancelled():
+                continue
+            self.active += 1
+            future.set_result(None)
+
+    def describe(self):
+        return (f"limit {self.limit:.1f} (peak {self.peak_limit:.1f}), {self.overloads} overload responses, "
+                f"{self.slow_calls} slow calls")
+
+
+# Shared by every ModelInterface in the process, so parallel components respect one limit
+_LIMITER = None
+
+
+def shared_limiter(config):
+    """The process-wide limiter, created from the `llm_concurrency_*` config keys on first use."""
+    global _LIMITER
+    if _LIMITER is None:
+        _LIMITER = AdaptiveLimiter(
+            initial=config.get("llm_concurrency_initial", 4),
+            min_limit=config.get("llm_concurrency_min", 1),
+            max_limit=config.get("llm_concurrency_max", 16),
+            latency_tolerance=config.get("llm_latency_tolerance", 3.0)
+        )
+    return _LIMITER
+
+
+def retry_delay(attempt, base=1.0, cap=30.0):
+    """Exponential backoff with full jitter, so retries from parallel calls do not line up."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
@@ -1,43 +1,173 @@
-from fireworks.client import AsyncFireworks
-from openai import AsyncOpenAI
+import asyncio
+import time
+from models.concurrency import (shared_limiter, is_overload_error, is_transport_error, retry_delay,
+                                DEFAULT_STAGE_PRIORITIES)
+from models.cassette import open_cassette
+from models.router import EndpointRouter
+from models.usage_tracker import UsageTracker
+from models.structured_output import extract_json, validate, empty_value, schema_instructions
 
 class ModelInterface:
     def __init__(self, model_id, config=None):
         self.model_id = model_id
         self.config = config or {}
         self.provider = self.config.get("provider", "fireworks")
-        
-        if self.provider == "openai":
-            self.client = AsyncOpenAI(
-                api_key=self.config.get("openai_api_key")
-            )
-        else:  # Default to fireworks
-            self.client = AsyncFireworks(
-                api_key=self.config.get("fireworks_api_key")
-            )
-    
-    async def generate(self, prompt, temperature=None, max_tokens=None):
-        """Generate a response using the LLM."""
+
+        # Native JSON mode; switched off per endpoint for the rest of the run if the endpoint rejects it
+        self.json_mode = self.config.get("json_mode", True)
+        self.max_repairs = self.config.get("structured_max_repairs", 1)
+
+        # Token usage and cost of every call, including prompt tokens served from the provider's cache
+        self.usage = UsageTracker(self.config)
+
+        # Pool of provider/model endpoints (just `model_id` unless `llm_endpoints` is set); each call
+        # goes to the fastest healthy one and fails over to the next. Providers load on first use.
+        self.router = EndpointRouter.from_config(model_id, self.config)
+
+        # Calls from every component share one adaptive concurrency limit; queued calls are
+        # admitted by the priority class of their stage
+        self.limiter = shared_limiter(self.config)
+        self.stage_priorities = dict(DEFAULT_STAGE_PRIORITIES)
+        self.stage_priorities.update(self.config.get("llm_stage_priorities", {}))
+        self.max_retries = self.config.get("llm_max_retries", 3)
+
+    async def generate(self, prompt, temperature=None, max_tokens=None, stage="other"):
+        """Generate a response using the LLM. `stage` labels the call in the usage accounting."""
+        return await self._complete([{"role": "user", "content": prompt}], temperature, max_tokens,
+                                    stage=stage)
+
+    async def generate_structured(self, prompt, schema, temperature=None, max_tokens=None, stage="other"):
+        """
+        Generate a JSON object matching `schema` (a JSON Schema subset, see
+        models/structured_output.py).
+
+        Uses the provider's JSON mode where available and a tolerant extractor
+        otherwise. If required fields are missing or invalid, the model is
+        asked in a follow-up turn for those fields only. Fields still missing
+        after `structured_max_repairs` attempts are filled with empty values.
+        """
+        # The format spec is static per stage, so it goes before the prompt to stay in the cached prefix
+        messages = [{"role": "user", "content": f"{schema_instructions(schema)}\n\n{prompt}"}]
+        response = await self._complete(messages, temperature, max_tokens, schema, stage)
+        result, missing = validate(extract_json(response), schema)
+
+        for _ in range(self.max_repairs):
+            if not missing:
+                break
+
+            print(f"    Structured output missing {', '.join(missing)}; asking for those fields only")
+            messages = messages + [
+                {"role": "assistant", "content": response},
+                {"role": "user", "content": (
+                    "Your answer did not contain valid values for: " + ", ".join(missing) + ".\n"
+                    + schema_instructions(schema, missing)
+                )}
+            ]
+            response = await self._complete(messages, temperature, max_tokens, schema, stage)
+            repaired, _ = validate(extract_json(response), schema)
+
+            for name in missing:
+                if name in repaired:
+                    result[name] = repaired[name]
+            missing = [name for name in missing if name not in result]
+
+        for name, prop in schema.get("properties", {}).items():
+            result.setdefault(name, empty_value(prop))
+
+        return result
+
+    async def _complete(self, messages, temperature=None, max_tokens=None, schema=None, stage="other"):
+        """Send a chat completion request and return the text of the first choice."""
         temp = temperature or self.config.get("temperature", 0.7)
         max_tok = max_tokens or self.config.get("max_tokens", 2048)
-        
-        if self.provider == "openai":
-            response = await self.client.chat.completions.create(
-                model=self.model_id,
-                messages=[
-                    {"role": "system", "content": "You are a helpful research assistant."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=temp,
-                max_tokens=max_tok
-            )
-        else:  # Fireworks
-            response = await self.client.chat.completions.acreate(
-                model=self.model_id,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=temp,
-                max_tokens=max_tok,
-                stream=False
-            )
-        
-        return response.choices[0].message.content
\ No newline at end of file
+
+        candidates = await self._route(messages, stage)
+        for index, endpoint in enumerate(candidates):
+            # Retry overloads in place only on the last endpoint; otherwise failing over is faster
+            retries = self.max_retries if index == len(candidates) - 1 else 0
+            try:
+                return await self._complete_on(endpoint, messages, temp, max_tok, schema, stage, retries)
+            except Exception as e:
+                if index == len(candidates) - 1:
+                    raise
+                print(f"    {endpoint.name} failed ({e}); failing over to {candidates[index + 1].name}")
+
+    async def _route(self, messages, stage):
+        """
+        Candidate endpoints for a call, best first. With a pool and a cassette, the order is
+        recorded with the run and read back on replay, where live latencies would pick differently.
+        """
+        candidates = self.router.candidates(stage)
+        cassette = open_cassette(self.config)
+        if cassette is None or len(self.router.endpoints) == 1:
+            return candidates
+
+        async def live():
+            return [e.name for e in candidates]
+
+        pool = sorted(self.router.by_name)
+        names = await cassette.call("route", {"stage": stage, "pool": pool, "messages": messages}, live)
+        return [self.router.by_name[name] for name in names]
+
+    async def _complete_on(self, endpoint, messages, temperature, max_tokens, schema, stage, retries):
+        """Run one completion on a given endpoint, falling back to prompt-only JSON if it rejects JSON mode."""
+        backend = self.router.backend(endpoint, self.config)
+        request = {
+            "model": endpoint.model_id,
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }
+
+        if schema is not None and self.json_mode and endpoint.json_mode:
+            if backend.supports_json_schema:  # e.g. Fireworks constrains decoding to the schema itself
+                request["response_format"] = {"type": "json_object", "schema": schema}
+            else:
+                request["response_format"] = {"type": "json_object"}
+
+        try:
+            return await self._send(endpoint, messages, request, stage, retries)
+        except Exception as e:
+            # Only treat request validation errors as "JSON mode unsupported"; let outages propagate
+            rejected = getattr(e, "status_code", None) in (400, 422) or "response_format" in str(e)
+            if "response_format" not in request or not rejected:
+                raise
+            print(f"    JSON mode rejected by {endpoint.model_id} ({e}); falling back to prompt-only JSON")
+            endpoint.json_mode = False
+            del request["response_format"]
+            return await self._send(endpoint, messages, request, stage, retries)
+
+    async def _send(self, endpoint, messages, request, stage, retries):
+        """Send one request through the shared limiter, retrying 429/5xx/timeouts with backoff."""
+        priority = self.stage_priorities.get(stage, "normal")
+
+        for attempt in range(retries + 1):
+            await self.limiter.acquire(priority)
+            start = time.monotonic()
+            try:
+                response = await endpoint.backend.create(messages, request)
+            except Exception as e:
+                overloaded = is_overload_error(e)
+                self.limiter.release(stage, overloaded=overloaded)
+                # Request errors (e.g. a 400 for an unsupported JSON mode) say nothing about endpoint health
+                if overloaded or is_transport_error(e):
+                    self.router.record_failure(endpoint)
+                if not overloaded or attempt == retries:
+                    raise
+                delay = retry_delay(attempt)
+                print(f"    {endpoint.model_id} overloaded ({e}); retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                self.limiter.release(stage)
+                raise
+
+            latency = time.monotonic() - start
+            self.limiter.release(stage, latency=latency)
+            self.router.record_success(endpoint, stage, latency)
+            break
+
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            self.usage.record(stage, endpoint.model_id, usage, latency)
+
+        return response.choices[0].message.content
@@ -0,0 +1,91 @@
+import importlib
+
+
+class Provider:
+    """
+    Chat completion backend used by ModelInterface.
+
+    A provider owns its SDK client and turns a request dict (model, temperature,
+    max_tokens and optionally response_format) plus chat messages into a
+    response object with `choices` and `usage`. SDKs are imported in the
+    constructor, so only the provider actually selected is ever loaded.
+    """
+
+    name = "provider"
+
+    # Whether response_format may carry the JSON Schema itself, not just {"type": "json_object"}
+    supports_json_schema = False
+
+    def __init__(self, config):
+        self.config = config
+
+    async def create(self, messages, request):
+        raise NotImplementedError
+
+
+class FireworksProvider(Provider):
+    name = "fireworks"
+    supports_json_schema = True
+
+    def __init__(self, config):
+        super().__init__(config)
+        from fireworks.client import AsyncFireworks
+        self.client = AsyncFireworks(api_key=config.get("fireworks_api_key"))
+
+    async def create(self, messages, request):
+        return await self.client.chat.completions.acreate(messages=messages, stream=False, **request)
+
+
+class OpenAIProvider(Provider):
+    name = "openai"
+
+    def __init__(self, config):
+        super().__init__(config)
+        from openai import AsyncOpenAI
+        self.client = AsyncOpenAI(api_key=config.get("openai_api_key"))
+
+    async def create(self, messages, request):
+        return await self.client.chat.completions.create(
+            messages=[{"role": "system", "content": "You are a helpful research assistant."}] + messages,
+            **request
+        )
+
+
+# Provider name -> "module:Class", resolved only when the provider is selected
+PROVIDER_REGISTRY = {
+    "fireworks": "models.providers:FireworksProvider",
+    "openai": "models.providers:OpenAIProvider",
+}
+
+
+def register_provider(name, target):
+    """Register a provider plugin as a Provider subclass or a lazy "module:Class" path."""
+    PROVIDER_REGISTRY[name] = target
+
+
+def provider_class(name, config):
+    """
+    Resolve the Provider class registered under `name`, without importing its SDK.
+    Plugins can also be declared in the `provider_plugins` config key as {name: "module:Class"}.
+    """
+    target = config.get("provider_plugins", {}).get(name) or PROVIDER_REGISTRY.get(name)
+    if target is None:
+        raise ValueError(f"Unknown model provider: {name} (known: {', '.join(sorted(PROVIDER_REGISTRY))})")
+
+    if isinstance(target, str):
+        module_name, _, class_name = target.partition(":")
+        target = getattr(importlib.import_module(module_name), class_name)
+
+    return target
+
+
+def load_provider(name, config):
+    """Instantiate the provider registered under `name`, wrapped in the run's cassette if one is active."""
+    cls = provider_class(name, config)
+
+    from models.cassette import open_cassette, CassetteProvider
+    cassette = open_cassette(config)
+    if cassette is not None:
+        return CassetteProvider(config, cassette, cls)
+
+    return cls(config)
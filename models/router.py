@@ -0,0 +1,149 @@
+import time
+from models.providers import load_provider
+
+
+class Endpoint:
+    """One provider + model pair in the routing pool, with its health statistics."""
+
+    def __init__(self, provider, model_id, weight=1.0, name=None):
+        self.provider = provider
+        self.model_id = model_id
+        self.weight = weight
+        self.name = name or f"{provider}:{model_id}"
+        self.backend = None
+
+        # Native JSON mode is switched off for this endpoint if it rejects it
+        self.json_mode = True
+
+        self.latency = {}  # stage -> EWMA of successful call latency, seconds
+        self.error_rate = 0.0  # EWMA of failures (1) and successes (0), as of `error_time`
+        self.error_time = 0.0
+        self.cooldown_until = 0.0
+        self.last_used = 0.0
+        self.calls = 0
+        self.errors = 0
+
+
+class EndpointRouter:
+    """
+    Routes each LLM call to the endpoint expected to answer fastest.
+
+    Endpoints are ranked by their EWMA latency for the call's stage (report and
+    extraction calls take far longer than query generation, so stages are not
+    mixed), inflated by their error rate and divided by their weight. Endpoints
+    without a measurement for the stage rank first so every one gets tried. The
+    error rate decays with a half-life of `error_half_life` seconds, so a recovered
+    endpoint is not penalised forever. An endpoint whose error rate passes
+    `unhealthy_error_rate` sits out for `cooldown` seconds and is only used as a
+    last resort. Every `probe_interval`-th call goes to the healthy endpoint that
+    has gone longest without traffic, so the statistics of endpoints that are not
+    chosen stay current. Stages listed in `pins` always go to the named endpoint.
+    """
+
+    def __init__(self, endpoints, pins=None, alpha=0.3, unhealthy_error_rate=0.5, cooldown=30.0,
+                 error_half_life=60.0, probe_interval=20):
+        self.endpoints = endpoints
+        self.by_name = {e.name: e for e in endpoints}
+        self.pins = pins or {}
+        self.alpha = alpha
+        self.unhealthy_error_rate = unhealthy_error_rate
+        self.cooldown = cooldown
+        self.error_half_life = error_half_life
+        self.probe_interval = probe_interval
+        self.probes = 0
+        self._routed = 0
+
+        for stage, name in self.pins.items():
+            if name not in self.by_name:
+                raise ValueError(f"Stage '{stage}' is pinned to unknown endpoint '{name}'")
+
+    @classmethod
+    def from_config(cls, model_id, config):
+        """
+        Pool from `llm_endpoints` ([{"provider", "model_id", "weight", "name"}]), or a
+        single endpoint for `model_id` on the configured provider.
+        """
+        specs = config.get("llm_endpoints") or [{"provider": config.get("provider", "fireworks"), "model_id": model_id}]
+        endpoints = [
+            Endpoint(spec.get("provider", "fireworks"), spec["model_id"], spec.get("weight", 1.0), spec.get("name"))
+            for spec in specs
+        ]
+        return cls(
+            endpoints,
+            pins=config.get("llm_stage_pins", {}),
+            alpha=config.get("llm_endpoint_ewma_alpha", 0.3),
+            cooldown=config.get("llm_endpoint_cooldown", 30.0),
+            error_half_life=config.get("llm_endpoint_error_half_life", 60.0),
+            probe_interval=config.get("llm_endpoint_probe_interval", 20)
+        )
+
+    def backend(self, endpoint, config):
+        """The endpoint's provider, loaded on first use so unused providers never import their SDK."""
+        if endpoint.backend is None:
+            endpoint.backend = load_provider(endpoint.provider, config)
+        return endpoint.backend
+
+    def candidates(self, stage):
+        """Endpoints to try for a call, best first."""
+        if stage in self.pins:
+            return [self.by_name[self.pins[stage]]]
+
+        now = time.monotonic()
+        healthy = sorted((e for e in self.endpoints if e.cooldown_until <= now),
+                         key=lambda e: self._cost(e, stage, now))
+        cooling = sorted((e for e in self.endpoints if e.cooldown_until > now), key=lambda e: e.cooldown_until)
+
+        self._routed += 1
+        if self.probe_interval and len(healthy) > 1 and self._routed % self.probe_interval == 0:
+            # Probe: put the healthy endpoint that has waited longest for traffic first
+            stalest = min(healthy[1:], key=lambda e: e.last_used)
+            healthy.remove(stalest)
+            healthy.insert(0, stalest)
+            self.probes += 1
+
+        return healthy + cooling
+
+    def _cost(self, endpoint, stage, now):
+        latency = endpoint.latency.get(stage)
+        if latency is None:
+            return 0.0
+        return latency * (1 + 4 * self._error_rate(endpoint, now)) / max(endpoint.weight, 1e-6)
+
+    def _error_rate(self, endpoint, now):
+        """Error rate decayed for the time since it was last updated."""
+        if not self.error_half_life:
+            return endpoint.error_rate
+        return endpoint.error_rate * 0.5 ** ((now - endpoint.error_time) / self.error_half_life)
+
+    def record_success(self, endpoint, stage, latency):
+        now = time.monotonic()
+        endpoint.calls += 1
+        endpoint.last_used = now
+        previous = endpoint.latency.get(stage)
+        endpoint.latency[stage] = latency if previous is None else (
+            self.alpha * latency + (1 - self.alpha) * previous
+        )
+        endpoint.error_rate = (1 - self.alpha) * self._error_rate(endpoint, now)
+        endpoint.error_time = now
+
+    def record_failure(self, endpoint):
+        """Count an overload, timeout or transport failure against the endpoint's health."""
+        now = time.monotonic()
+        endpoint.calls += 1
+        endpoint.errors += 1
+        endpoint.last_used = now
+        endpoint.error_rate = self.alpha + (1 - self.alpha) * self._error_rate(endpoint, now)
+        endpoint.error_time = now
+        if endpoint.error_rate >= self.unhealthy_error_rate:
+            endpoint.cooldown_until = now + self.cooldown
+
+    def describe(self):
+        now = time.monotonic()
+        lines = []
+        for e in self.endpoints:
+            latency = ", ".join(f"{stage} {value:.2f}s" for stage, value in sorted(e.latency.items())) or "n/a"
+            lines.append(f"{e.name}: {e.calls} calls, {e.errors} errors, "
+                         f"latency EWMA {latency}, error rate {self._error_rate(e, now):.2f}")
+        if self.probes:
+            lines.append(f"{self.probes} probe calls to endpoints not ranked first")
+        return lines
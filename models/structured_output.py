@@ -0,0 +1,155 @@
+import json
+import re
+
+# Python types accepted for each JSON Schema type name
+JSON_TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "number": (int, float),
+    "integer": int,
+    "boolean": bool
+}
+
+
+def extract_json(text):
+    """
+    Pull the first JSON object out of a model response.
+
+    Tolerates markdown code fences, prose before or after the object and
+    trailing commas. Returns None if no object can be recovered.
+    """
+    if not text:
+        return None
+
+    fenced = re.search(r"```(?:json)?\s*(.*?)```", text, re.DOTALL)
+    candidates = [fenced.group(1)] if fenced else []
+    candidates.append(text)
+
+    for candidate in candidates:
+        start = candidate.find("{")
+        while start != -1:
+            end = _matching_brace(candidate, start)
+            if end == -1:
+                break
+            snippet = candidate[start:end + 1]
+            for attempt in (snippet, re.sub(r",\s*([}\]])", r"\1", snippet)):
+                try:
+                    data = json.loads(attempt)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(data, dict):
+                    return data
+            start = candidate.find("{", start + 1)
+
+    return None
+
+
+def _matching_brace(text, start):
+    """Index of the brace closing the one at `start`, skipping braces inside strings."""
+    depth = 0
+    in_string = False
+    escaped = False
+
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return i
+
+    return -1
+
+
+def validate(data, schema):
+    """
+    Validate a parsed object against a small JSON Schema subset (object
+    properties, required, type, items, minItems, minLength).
+
+    Returns (clean, missing): `clean` holds every property that validated, with
+    array items of the wrong type dropped; `missing` lists required properties
+    that are absent or invalid.
+    """
+    clean = {}
+    missing = []
+    data = data if isinstance(data, dict) else {}
+
+    for name, prop in schema.get("properties", {}).items():
+        value = _coerce(data.get(name), prop)
+        if value is not None:
+            clean[name] = value
+        elif name in schema.get("required", []):
+            missing.append(name)
+
+    return clean, missing
+
+
+def _coerce(value, prop):
+    """Return the value if it satisfies the property schema (after light coercion), else None."""
+    expected = prop.get("type")
+    if value is None:
+        return None
+
+    if expected == "array":
+        if isinstance(value, str):
+            value = [value]
+        if not isinstance(value, list):
+            return None
+        item_schema = prop.get("items", {})
+        items = [_coerce(item, item_schema) for item in value]
+        value = [item for item in items if item is not None]
+        if len(value) < prop.get("minItems", 0):
+            return None
+        return value
+
+    if expected == "string":
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            value = str(value)
+        if not isinstance(value, str):
+            return None
+        value = value.strip()
+        if len(value) < prop.get("minLength", 0):
+            return None
+        return value
+
+    if expected == "object" and "properties" in prop:
+        clean, missing = validate(value, prop)
+        return None if missing or not isinstance(value, dict) else clean
+
+    if expected in JSON_TYPES and not isinstance(value, JSON_TYPES[expected]):
+        return None
+
+    return value
+
+
+def empty_value(prop):
+    """Default used for a property the model never produced."""
+    return {"array": [], "string": "", "object": {}}.get(prop.get("type"))
+
+
+def schema_instructions(schema, fields=None):
+    """Prompt text describing the expected JSON object, optionally limited to some fields."""
+    properties = schema.get("properties", {})
+    if fields is not None:
+        properties = {name: prop for name, prop in properties.items() if name in fields}
+
+    lines = ["Respond with a single JSON object and nothing else, with these fields:"]
+    for name, prop in properties.items():
+        kind = prop.get("type", "string")
+        if kind == "array":
+            kind = f"array of {prop.get('items', {}).get('type', 'string')}s"
+        description = prop.get("description", "")
+        lines.append(f'- "{name}" ({kind}): {description}'.rstrip(": "))
+
+    return "\n".join(lines)
@@ -0,0 +1,186 @@
+import contextvars
+import time
+
+# USD per million tokens; "cached_input" applies to prompt tokens served from the provider's prefix cache
+DEFAULT_PRICING = {
+    "accounts/fireworks/models/llama4-maverick-instruct-basic": {"input": 0.22, "output": 0.88},
+    "accounts/fireworks/models/llama4-scout-instruct-basic": {"input": 0.15, "output": 0.60},
+    "gpt-4o": {"input": 2.50, "cached_input": 1.25, "output": 10.00},
+}
+
+# Research iteration that calls are billed to. Each asyncio task keeps the value it was created
+# with, so background work (draft updates, speculative plans) stays tagged with its own iteration.
+_ITERATION = contextvars.ContextVar("usage_iteration", default=0)
+
+
+class UsageTracker:
+    """Records token usage and cost of every LLM call, tagged with stage and research iteration."""
+
+    def __init__(self, config=None):
+        config = config or {}
+        self.pricing = dict(DEFAULT_PRICING)
+        self.pricing.update(config.get("pricing", {}))
+
+        self.records = []
+        self.start_time = time.monotonic()
+
+    def reset(self):
+        """Start a new run: forget earlier calls and restart the clock."""
+        self.records = []
+        _ITERATION.set(0)
+        self.start_time = time.monotonic()
+
+    def set_iteration(self, iteration):
+        """Bill later calls of the current task, and of tasks it starts, to `iteration` (0 = setup/report)."""
+        _ITERATION.set(iteration)
+
+    def record(self, stage, model_id, usage, latency):
+        """Store one call's usage block (as returned by the provider) and return the record."""
+        prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+        completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached_tokens = (getattr(details, "cached_tokens", 0) or 0) if details is not None else 0
+
+        record = {
+            "stage": stage,
+            "iteration": _ITERATION.get(),
+            "model": model_id,
+            "prompt_tokens": prompt_tokens,
+            "cached_tokens": cached_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "cost": self._cost(model_id, prompt_tokens, cached_tokens, completion_tokens),
+            "latency": round(latency, 3)
+        }
+        self.records.append(record)
+        return record
+
+    def _cost(self, model_id, prompt_tokens, cached_tokens, completion_tokens):
+        price = self.pricing.get(model_id)
+        if not price:
+            return 0.0
+        cached_price = price.get("cached_input", price["input"])
+        return (
+            (prompt_tokens - cached_tokens) * price["input"]
+            + cached_tokens * cached_price
+            + completion_tokens * price["output"]
+        ) / 1_000_000
+
+    @property
+    def total_tokens(self):
+        return sum(r["total_tokens"] for r in self.records)
+
+    @property
+    def total_cost(self):
+        return sum(r["cost"] for r in self.records)
+
+    @property
+    def elapsed(self):
+        return time.monotonic() - self.start_time
+
+    def _group(self, key):
+        groups = {}
+        for r in self.records:
+            group = groups.setdefault(r[key], {"calls": 0, "prompt_tokens": 0, "cached_tokens": 0,
+                                              "completion_tokens": 0, "total_tokens": 0, "cost": 0.0})
+            group["calls"] += 1
+            for field in ("prompt_tokens", "cached_tokens", "completion_tokens", "total_tokens", "cost"):
+                group[field] += r[field]
+        return groups
+
+    def summary(self):
+        """Totals for the run, broken down by stage and by iteration."""
+        return {
+            "calls": len(self.records),
+            "prompt_tokens": sum(r["prompt_tokens"] for r in self.records),
+            "cached_tokens": sum(r["cached_tokens"] for r in self.records),
+            "completion_tokens": sum(r["completion_tokens"] for r in self.records),
+            "total_tokens": self.total_tokens,
+            "cost": round(self.total_cost, 6),
+            "elapsed_seconds": round(self.elapsed, 1),
+            "by_stage": self._group("stage"),
+            "by_iteration": self._group("iteration")
+        }
+
+    def format_summary(self):
+        """Human-readable usage summary for the CLI."""
+        s = self.summary()
+        lines = [
+            f"  LLM calls: {s['calls']}, tokens: {s['total_tokens']} "
+            f"({s['prompt_tokens']} prompt, {s['cached_tokens']} cached, {s['completion_tokens']} completion), "
+            f"cost: ${s['cost']:.4f}, wall-clock: {s['elapsed_seconds']}s"
+        ]
+        for stage, g in s["by_stage"].items():
+            lines.append(f"    {stage}: {g['calls']} calls, {g['total_tokens']} tokens, ${g['cost']:.4f}")
+        for iteration, g in sorted(s["by_iteration"].items()):
+            label = f"iteration {iteration}" if iteration else "setup/report"
+            lines.append(f"    {label}: {g['calls']} calls, {g['total_tokens']} tokens, ${g['cost']:.4f}")
+        return "\n".join(lines)
+
+
+class RunBudget:
+    """
+    Optional per-run ceiling on tokens, dollars and/or wall-clock seconds.
+
+    The coordinator asks for the remaining fraction of the tightest limit and
+    degrades the run as it shrinks: smaller breadth first, then no refinement
+    call, then no further iterations. A share of the budget is always kept back
+    so the final report can still be written.
+    """
+
+    def __init__(self, max_tokens=None, max_cost=None, max_seconds=None, report_reserve=0.15,
+                 shrink_below=0.5, skip_refinement_below=0.3):
+        self.max_tokens = max_tokens
+        self.max_cost = max_cost
+        self.max_seconds = max_seconds
+        self.report_reserve = report_reserve
+        self.shrink_below = shrink_below
+        self.skip_refinement_below = skip_refinement_below
+
+    @classmethod
+    def from_config(cls, config):
+        """Build a budget from the `budget_*` config keys, or return None if no limit is set."""
+        limits = {
+            "max_tokens": config.get("budget_max_tokens"),
+            "max_cost": config.get("budget_max_cost"),
+            "max_seconds": config.get("budget_max_seconds")
+        }
+        if not any(limits.values()):
+            return None
+        return cls(report_reserve=config.get("budget_report_reserve", 0.15), **limits)
+
+    def remaining_fraction(self, usage):
+        """Fraction of the tightest limit still unused, in [0, 1]."""
+        fractions = []
+        if self.max_tokens:
+            fractions.append(1 - usage.total_tokens / self.max_tokens)
+        if self.max_cost:
+            fractions.append(1 - usage.total_cost / self.max_cost)
+        if self.max_seconds:
+            fractions.append(1 - usage.elapsed / self.max_seconds)
+        return max(0.0, min(fractions, default=1.0))
+
+    def reserved_for_report(self, usage):
+        """True once only the report reserve is left and research work must stop."""
+        return self.remaining_fraction(usage) <= self.report_reserve
+
+    def scaled_breadth(self, breadth, usage):
+        """Breadth for the next iteration, reduced linearly once the budget drops below `shrink_below`."""
+        remaining = self.remaining_fraction(usage)
+        if remaining >= self.shrink_below:
+            return breadth
+        usable = (remaining - self.report_reserve) / (self.shrink_below - self.report_reserve)
+        return max(1, round(breadth * max(0.0, usable)))
+
+    def allows_refinement(self, usage):
+        return self.remaining_fraction(usage) >= self.skip_refinement_below
+
+    def describe(self):
+        limits = []
+        if self.max_tokens:
+            limits.append(f"{self.max_tokens} tokens")
+        if self.max_cost:
+            limits.append(f"${self.max_cost:.2f}")
+        if self.max_seconds:
+            limits.append(f"{self.max_seconds:.0f}s")
+        return ", ".join(limits)
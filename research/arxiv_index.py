@@ -0,0 +1,397 @@
+import json
+import re
+import sqlite3
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from pathlib import Path
+
+
+class ArxivIndex:
+    """Local SQLite FTS5 index over arXiv metadata, used as an offline search backend."""
+
+    # Relative BM25 weights for the indexed columns: title, summary, authors, categories
+    BM25_WEIGHTS = (10.0, 1.0, 3.0, 0.5)
+
+    OAI_NAMESPACES = {
+        'oai': 'http://www.openarchives.org/OAI/2.0/',
+        'arxiv': 'http://arxiv.org/OAI/arXiv/',
+        'oai_dc': 'http://www.openarchives.org/OAI/2.0/oai_dc/',
+        'dc': 'http://purl.org/dc/elements/1.1/'
+    }
+
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Searches run in worker threads (see LocalIndexBackend), so allow cross-thread use
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self._create_schema()
+
+    def _create_schema(self):
+        """Create the papers table, its FTS5 shadow index and the sync triggers."""
+        self.conn.executescript("""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+
+            CREATE TABLE IF NOT EXISTS papers (
+                rowid INTEGER PRIMARY KEY,
+                arxiv_id TEXT UNIQUE NOT NULL,
+                title TEXT,
+                summary TEXT,
+                authors TEXT,
+                categories TEXT,
+                published TEXT,
+                updated TEXT,
+                comment TEXT,
+                journal_ref TEXT,
+                doi TEXT
+            );
+            CREATE INDEX IF NOT EXISTS papers_published ON papers(published);
+
+            CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5(
+                title, summary, authors, categories,
+                content='papers', content_rowid='rowid',
+                tokenize='porter unicode61'
+            );
+
+            CREATE TRIGGER IF NOT EXISTS papers_ai AFTER INSERT ON papers BEGIN
+                INSERT INTO papers_fts(rowid, title, summary, authors, categories)
+                VALUES (new.rowid, new.title, new.summary, new.authors, new.categories);
+            END;
+            CREATE TRIGGER IF NOT EXISTS papers_ad AFTER DELETE ON papers BEGIN
+                INSERT INTO papers_fts(papers_fts, rowid, title, summary, authors, categories)
+                VALUES ('delete', old.rowid, old.title, old.summary, old.authors, old.categories);
+            END;
+            CREATE TRIGGER IF NOT EXISTS papers_au AFTER UPDATE ON papers BEGIN
+                INSERT INTO papers_fts(papers_fts, rowid, title, summary, authors, categories)
+                VALUES ('delete', old.rowid, old.title, old.summary, old.authors, old.categories);
+                INSERT INTO papers_fts(rowid, title, summary, authors, categories)
+                VALUES (new.rowid, new.title, new.summary, new.authors, new.categories);
+            END;
+        """)
+
+    def close(self):
+        self.conn.close()
+
+    def count(self):
+        """Return the number of papers in the index."""
+        return self.conn.execute("SELECT COUNT(*) FROM papers").fetchone()[0]
+
+    def add_papers(self, papers):
+        """
+        Insert or update papers. A paper that is already indexed is only rewritten
+        when the incoming record has a newer `updated` date, so re-ingesting a
+        fresher snapshot acts as an incremental update.
+
+        Returns a dict with the number of inserted, updated and skipped records.
+        """
+        stats = {"inserted": 0, "updated": 0, "skipped": 0}
+
+        with self.conn:
+            for paper in papers:
+                arxiv_id = paper.get("arxiv_id")
+                if not arxiv_id:
+                    stats["skipped"] += 1
+                    continue
+
+                row = (
+                    arxiv_id,
+                    paper.get("title", ""),
+                    paper.get("summary", ""),
+                    ", ".join(paper.get("authors", [])),
+                    " ".join(paper.get("categories", [])),
+                    paper.get("published", ""),
+                    paper.get("updated", ""),
+                    paper.get("comment", ""),
+                    paper.get("journal_ref", ""),
+                    paper.get("doi", "")
+                )
+
+                existing = self.conn.execute(
+                    "SELECT updated FROM papers WHERE arxiv_id = ?", (arxiv_id,)
+                ).fetchone()
+
+                if existing is None:
+                    self.conn.execute(
+                        "INSERT INTO papers (arxiv_id, title, summary, authors, categories, "
+                        "published, updated, comment, journal_ref, doi) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        row
+                    )
+                    stats["inserted"] += 1
+                elif (paper.get("updated") or "") > (existing["updated"] or ""):
+                    self.conn.execute(
+                        "UPDATE papers SET title = ?, summary = ?, authors = ?, categories = ?, "
+                        "published = ?, updated = ?, comment = ?, journal_ref = ?, doi = ? "
+                        "WHERE arxiv_id = ?",
+                        row[1:] + (arxiv_id,)
+                    )
+                    stats["updated"] += 1
+                else:
+                    stats["skipped"] += 1
+
+        return stats
+
+    def ingest_jsonl(self, path, batch_size=5000):
+        """Bulk-load a Kaggle-style arXiv metadata snapshot (one JSON object per line)."""
+        totals = {"inserted": 0, "updated": 0, "skipped": 0}
+        batch = []
+
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                batch.append(self._paper_from_kaggle(json.loads(line)))
+                if len(batch) >= batch_size:
+                    self._merge_stats(totals, self.add_papers(batch))
+                    batch = []
+
+        if batch:
+            self._merge_stats(totals, self.add_papers(batch))
+
+        return totals
+
+    def ingest_oai_xml(self, path, batch_size=5000):
+        """Bulk-load an OAI-PMH ListRecords dump in the `arXiv` or `oai_dc` metadata format."""
+        totals = {"inserted": 0, "updated": 0, "skipped": 0}
+        batch = []
+        record_tag = f"{{{self.OAI_NAMESPACES['oai']}}}record"
+
+        # Stream the dump so multi-gigabyte harvests never have to fit in memory
+        for _, element in ET.iterparse(path, events=("end",)):
+            if element.tag != record_tag:
+                continue
+
+            paper = self._paper_from_oai_record(element)
+            element.clear()
+
+            if paper:
+                batch.append(paper)
+            if len(batch) >= batch_size:
+                self._merge_stats(totals, self.add_papers(batch))
+                batch = []
+
+        if batch:
+            self._merge_stats(totals, self.add_papers(batch))
+
+        return totals
+
+    # FTS5 columns searched for each SearchFilters field
+    FIELD_COLUMNS = {"title": "title", "abstract": "summary", "author": "authors"}
+
+    # ORDER BY clause for each SearchFilters sort order
+    SORT_COLUMNS = {"submitted": "p.published DESC", "updated": "p.updated DESC"}
+
+    def search(self, query, limit=10, filters=None):
+        """
+        Search the index with BM25 ranking and return papers in the arXiv API record shape.
+
+        `filters` (a SearchFilters) restricts the match to one field, filters by
+        category and publication date in SQL, and can sort by date instead of BM25.
+        """
+        match_expr = self._to_match_expression(query)
+        if not match_expr:
+            return []
+
+        conditions = ["papers_fts MATCH ?"]
+        params = []
+        order = f"bm25(papers_fts, {', '.join(str(w) for w in self.BM25_WEIGHTS)})"
+
+        if filters is not None:
+            if filters.field in self.FIELD_COLUMNS:
+                match_expr = f"{{{self.FIELD_COLUMNS[filters.field]}}} : ({match_expr})"
+            if filters.categories:
+                # categories is space-separated; a name matches itself ("quant-ph", "cs.LG") and,
+                # as a whole archive ("cs"), any category within it
+                conditions.append("(" + " OR ".join(
+                    "(' ' || p.categories || ' ') LIKE ?" for _ in range(2 * len(filters.categories))
+                ) + ")")
+                for c in filters.categories:
+                    params.extend([f"% {c} %", f"% {c}.%"])
+            if filters.date_from:
+                conditions.append("substr(p.published, 1, 10) >= ?")
+                params.append(filters.date_from)
+            if filters.date_to:
+                conditions.append("substr(p.published, 1, 10) <= ?")
+                params.append(filters.date_to)
+            order = self.SORT_COLUMNS.get(filters.sort, order)
+
+        rows = self.conn.execute(
+            "SELECT p.* FROM papers_fts "
+            "JOIN papers p ON p.rowid = papers_fts.rowid "
+            f"WHERE {' AND '.join(conditions)} "
+            f"ORDER BY {order} "
+            "LIMIT ?",
+            [match_expr] + params + [limit]
+        ).fetchall()
+
+        return [self._row_to_paper(row) for row in rows]
+
+    def _row_to_paper(self, row):
+        """Convert a database row into the same dict WebSearcher builds from the arXiv API."""
+        arxiv_id = row["arxiv_id"]
+        return {
+            'title': row["title"] or "",
+            'authors': [a.strip() for a in (row["authors"] or "").split(",") if a.strip()],
+            'summary': row["summary"] or "",
+            'published': row["published"] or "",
+            'updated': row["updated"] or "",
+            'url': f"http://arxiv.org/pdf/{arxiv_id}",
+            'id': f"http://arxiv.org/abs/{arxiv_id}",
+            'arxiv_id': arxiv_id,
+            'comment': row["comment"] or "",
+            'journal_ref': row["journal_ref"] or "",
+            'categories': (row["categories"] or "").split(),
+            'doi': row["doi"] or ""
+        }
+
+    def _to_match_expression(self, query):
+        """
+        Translate an arXiv-style query into an FTS5 MATCH expression.
+
+        Quoted phrases and AND/OR/NOT operators are kept; every other token is
+        quoted so punctuation cannot break the FTS5 syntax. Adjacent terms are
+        joined with OR so that BM25 ranks documents matching more terms higher,
+        which mirrors the recall-oriented behaviour of arXiv's `all:` search.
+        """
+        tokens = re.findall(r'"[^"]+"|\S+', query)
+        parts = []
+
+        for token in tokens:
+            if token in ("AND", "OR", "NOT"):
+                # Drop leading or doubled operators that would make the expression invalid
+                if parts and parts[-1] not in ("AND", "OR", "NOT"):
+                    parts.append(token)
+                continue
+
+            words = re.findall(r"\w+", token.strip('"'))
+            if not words:
+                continue
+
+            if parts and parts[-1] not in ("AND", "OR", "NOT"):
+                parts.append("OR")
+            parts.append('"' + " ".join(words) + '"')
+
+        while parts and parts[-1] in ("AND", "OR", "NOT"):
+            parts.pop()
+
+        return " ".join(parts)
+
+    def _paper_from_kaggle(self, record):
+        """Normalise one record of the Kaggle arXiv metadata snapshot."""
+        versions = record.get("versions") or []
+        published = ""
+        if versions:
+            published = self._parse_date(versions[0].get("created", ""))
+
+        authors_parsed = record.get("authors_parsed")
+        if authors_parsed:
+            authors = [" ".join(p for p in (parts[1], parts[0]) if p).strip() for parts in authors_parsed]
+        else:
+            authors = re.split(r",\s*|\s+and\s+", record.get("authors", ""))
+
+        return {
+            "arxiv_id": record.get("id", ""),
+            "title": self._squash(record.get("title", "")),
+            "summary": self._squash(record.get("abstract", "")),
+            "authors": [a.strip() for a in authors if a.strip()],
+            "categories": (record.get("categories") or "").split(),
+            "published": published,
+            "updated": self._parse_date(record.get("update_date", "")) or published,
+            "comment": record.get("comments") or "",
+            "journal_ref": record.get("journal-ref") or "",
+            "doi": record.get("doi") or ""
+        }
+
+    def _paper_from_oai_record(self, record):
+        """Normalise one OAI-PMH <record>, or return None for deleted or unknown records."""
+        ns = self.OAI_NAMESPACES
+
+        header = record.find("oai:header", ns)
+        if header is not None and header.get("status") == "deleted":
+            return None
+
+        meta = record.find("oai:metadata/arxiv:arXiv", ns)
+        if meta is not None:
+            authors = []
+            for author in meta.findall("arxiv:authors/arxiv:author", ns):
+                forenames = self._text(author, "arxiv:forenames", ns)
+                keyname = self._text(author, "arxiv:keyname", ns)
+                authors.append(" ".join(p for p in (forenames, keyname) if p))
+
+            created = self._parse_date(self._text(meta, "arxiv:created", ns))
+            return {
+                "arxiv_id": self._text(meta, "arxiv:id", ns),
+                "title": self._squash(self._text(meta, "arxiv:title", ns)),
+                "summary": self._squash(self._text(meta, "arxiv:abstract", ns)),
+                "authors": authors,
+                "categories": self._text(meta, "arxiv:categories", ns).split(),
+                "published": created,
+                "updated": self._parse_date(self._text(meta, "arxiv:updated", ns)) or created,
+                "comment": self._text(meta, "arxiv:comments", ns),
+                "journal_ref": self._text(meta, "arxiv:journal-ref", ns),
+                "doi": self._text(meta, "arxiv:doi", ns)
+            }
+
+        meta = record.find("oai:metadata/oai_dc:dc", ns)
+        if meta is not None:
+            arxiv_id = ""
+            for identifier in meta.findall("dc:identifier", ns):
+                if identifier.text and "arxiv.org/abs/" in identifier.text:
+                    arxiv_id = identifier.text.rsplit("arxiv.org/abs/", 1)[1].strip()
+
+            dates = sorted(self._parse_date(d.text or "") for d in meta.findall("dc:date", ns))
+            dates = [d for d in dates if d]
+            return {
+                "arxiv_id": arxiv_id,
+                "title": self._squash(self._text(meta, "dc:title", ns)),
+                "summary": self._squash(self._text(meta, "dc:description", ns)),
+                "authors": [self._flip_name(c.text) for c in meta.findall("dc:creator", ns) if c.text],
+                "categories": [],
+                "published": dates[0] if dates else "",
+                "updated": dates[-1] if dates else "",
+                "comment": "",
+                "journal_ref": "",
+                "doi": ""
+            }
+
+        return None
+
+    @staticmethod
+    def _merge_stats(totals, stats):
+        for key, value in stats.items():
+            totals[key] += value
+
+    @staticmethod
+    def _text(element, xpath, namespaces):
+        el = element.find(xpath, namespaces)
+        return el.text.strip() if el is not None and el.text else ""
+
+    @staticmethod
+    def _squash(text):
+        """Collapse the hard line wraps used in arXiv titles and abstracts."""
+        return " ".join(text.split())
+
+    @staticmethod
+    def _flip_name(name):
+        """Turn a Dublin Core 'Last, First' creator into 'First Last'."""
+        if "," in name:
+            last, first = name.split(",", 1)
+            return f"{first.strip()} {last.strip()}"
+        return name.strip()
+
+    @staticmethod
+    def _parse_date(value):
+        """Normalise the date formats found in arXiv dumps to the ISO form used by the API."""
+        value = (value or "").strip()
+        if not value:
+            return ""
+
+        for fmt in ("%a, %d %b %Y %H:%M:%S %Z", "%Y-%m-%d", "%Y-%m-%dT%H:%M:%SZ"):
+            try:
+                return datetime.strptime(value, fmt).strftime("%Y-%m-%dT%H:%M:%SZ")
+            except ValueError:
+                continue
+
+        return value
@@ -1,10 +1,68 @@
+import asyncio
+from research.prompts import render_prompt, PROMPT_REGISTRY
+from research.extraction_store import ExtractionStore
+from research.text_similarity import tokenize, query_coverage
+
 class ContentProcessor:
+    SCHEMA = {
+        "type": "object",
+        "properties": {
+            "learnings": {
+                "type": "array",
+                "items": {"type": "string", "minLength": 1},
+                "description": "key learnings and facts that address the research goals"
+            },
+            "directions": {
+                "type": "array",
+                "items": {"type": "string", "minLength": 1},
+                "description": "new research directions or questions to explore further"
+            }
+        },
+        "required": ["learnings", "directions"]
+    }
+    
+    # Context-independent per-paper extraction, stored and reused across runs
+    PAPER_SCHEMA = {
+        "type": "object",
+        "properties": {
+            "papers": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "id": {"type": "string", "minLength": 1},
+                        "learnings": {"type": "array", "items": {"type": "string", "minLength": 1}},
+                        "questions": {"type": "array", "items": {"type": "string", "minLength": 1}}
+                    },
+                    "required": ["id", "learnings"]
+                },
+                "description": 'one entry per paper: {"id", "learnings": [key findings], "questions": [open questions]}'
+            }
+        },
+        "required": ["papers"]
+    }
+    
+    # Characters of each paper's content put into an extraction prompt
+    EXCERPT_LENGTH = 2000
+    
     def __init__(self, model_interface, config):
         self.model = model_interface
         self.config = config
+        
+        # With a store, papers are extracted once and later runs only rank the stored learnings
+        store_path = config.get("extraction_store_path")
+        self.store = ExtractionStore(store_path) if store_path else None
+        self.max_learnings = config.get("extraction_max_learnings", 12)
+    
+    def excerpt_capacity(self):
+        """Number of paper excerpts that fit into one query's extraction prompt."""
+        return max(1, self.config.get("max_content_length", 15000) // self.EXCERPT_LENGTH)
     
     async def process_search_results(self, query, results, context):
         """Process search results to extract key learnings and new directions."""
+        if self.store is not None:
+            return await self._process_with_store(query, results, context)
+        
         content_items = []
         
         # Combine content from results, respecting max length
@@ -13,59 +71,100 @@ class ContentProcessor:
         
         for result in results:
             if "content" in result and result["content"]:
-                excerpt = result["content"][:2000]  # Limit each result
+                excerpt = result["content"][:self.EXCERPT_LENGTH]  # Limit each result
                 if total_length + len(excerpt) <= max_length:
                     content_items.append(f"Source: {result['url']}\nTitle: {result['title']}\n\n{excerpt}\n")
                     total_length += len(excerpt)
         
         combined_content = "\n---\n".join(content_items)
         
-        prompt = f"""
-        Based on the following search results for the query "{query}" and the current research context,
-        identify:
-        1. Key learnings and facts that address the research goals
-        2. New research directions or questions to explore further
-        
-        CURRENT RESEARCH CONTEXT:
-        {context}
-        
-        SEARCH RESULTS:
-        {combined_content}
+        prompt = render_prompt(
+            "content_extraction",
+            query=query,
+            context=context,
+            results=combined_content
+        )
         
-        OUTPUT FORMAT:
-        LEARNINGS:
-        - [Key learning 1]
-        - [Key learning 2]
-        ...
+        response = await self.model.generate_structured(prompt, self.SCHEMA, stage="content_extraction")
         
-        NEW DIRECTIONS:
-        - [New research direction/question 1]
-        - [New research direction/question 2]
-        ...
+        return {
+            "learnings": response["learnings"],
+            "directions": response["directions"],
+            "sources": [r.get("url") for r in results if "url" in r]
+        }
+    
+    async def _process_with_store(self, query, results, context):
+        """
+        Reuse stored per-paper extractions and extract only the papers not seen before.
+        Every learning from a newly extracted paper is kept; learnings reused from the store
+        are ranked by how well they cover this query and context, and only the best are kept.
         """
+        version = PROMPT_REGISTRY["paper_extraction"].key
+        papers = {self.store.paper_key(r): r for r in results if r.get("content")}
+        
+        reused = self.store.get_many(list(papers), version)
+        new_papers = {key: paper for key, paper in papers.items() if key not in reused}
+        print(f"    Extraction store: {len(reused)} papers reused, {len(new_papers)} to extract")
         
-        response = await self.model.generate(prompt)
+        extracted = {}
+        if new_papers:
+            extracted = await self._extract_papers(new_papers)
+            self.store.put_many(extracted, version, getattr(self.model, "model_id", ""))
         
-        # Parse response to extract learnings and directions
-        learnings = []
-        directions = []
+        query_tokens = tokenize(query)
+        context_tokens = tokenize(context)
         
-        current_section = None
+        def ranked(statements, limit):
+            statements = list(dict.fromkeys(statements))
+            statements.sort(key=lambda text: query_coverage(tokenize(text), query_tokens, context_tokens),
+                            reverse=True)
+            return statements[:limit]
         
-        for line in response.split("\n"):
-            if "LEARNINGS:" in line:
-                current_section = "learnings"
-            elif "NEW DIRECTIONS:" in line:
-                current_section = "directions"
-            elif line.strip().startswith("- ") and current_section:
-                item = line.strip()[2:].strip()
-                if current_section == "learnings":
-                    learnings.append(item)
-                else:
-                    directions.append(item)
+        new_learnings = list(dict.fromkeys(l for e in extracted.values() for l in e["learnings"]))
+        reused_learnings = [l for e in reused.values() for l in e["learnings"] if l not in new_learnings]
+        all_questions = [q for e in list(extracted.values()) + list(reused.values()) for q in e["questions"]]
         
         return {
-            "learnings": learnings,
-            "directions": directions,
-            "sources": [r.get("url") for r in results if "url" in r]
-        }
\ No newline at end of file
+            "learnings": new_learnings + ranked(reused_learnings, self.max_learnings),
+            "directions": ranked(all_questions, 5),
+            "sources": [r.get("url") for r in results if "url" in r],
+            "reused_papers": len(reused),
+            "extracted_papers": len(new_papers)
+        }
+    
+    async def _extract_papers(self, papers):
+        """Extract context-independent learnings for each paper; batches stay within max_content_length."""
+        max_length = self.config.get("max_content_length", 15000)
+        batches, batch, batch_length = [], [], 0
+        
+        for key, paper in papers.items():
+            excerpt = paper["content"][:self.EXCERPT_LENGTH]
+            if batch and batch_length + len(excerpt) > max_length:
+                batches.append(batch)
+                batch, batch_length = [], 0
+            batch.append(f"Paper ID: {key}\nTitle: {paper['title']}\n\n{excerpt}\n")
+            batch_length += len(excerpt)
+        if batch:
+            batches.append(batch)
+        
+        responses = await asyncio.gather(*(
+            self.model.generate_structured(
+                render_prompt("paper_extraction", papers="\n---\n".join(items)),
+                self.PAPER_SCHEMA,
+                stage="paper_extraction"
+            )
+            for items in batches
+        ))
+        
+        extracted = {}
+        for response in responses:
+            for entry in response["papers"]:
+                if entry["id"] in papers:
+                    extracted[entry["id"]] = {
+                        "title": papers[entry["id"]]["title"],
+                        "learnings": entry["learnings"],
+                        "questions": entry.get("questions", [])
+                    }
+        
+        # Papers the model skipped are not stored, so a later run tries them again
+        return extracted
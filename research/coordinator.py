@@ -1,107 +1,625 @@
+import asyncio
+import contextlib
+from research.novelty_tracker import NoveltyTracker
+from research.research_memory import ResearchMemory
+from research.search_filters import SearchFilters
+from research.yield_allocator import YieldAllocator
+from research.text_similarity import tokenize, max_similarity
+from models.usage_tracker import RunBudget
+
 class ResearchCoordinator:
-    def __init__(self, query_generator, web_searcher, content_processor, research_refiner, report_generator):
+    def __init__(self, query_generator, web_searcher, content_processor, research_refiner, report_generator,
+                 config=None, progress_callback=None, usage_tracker=None):
         self.query_generator = query_generator
         self.web_searcher = web_searcher
         self.content_processor = content_processor
         self.research_refiner = research_refiner
         self.report_generator = report_generator
-        
+        self.config = config or {}
+
+        # Optional callable(event, data) used by front ends to follow the run
+        self.progress_callback = progress_callback
+
+        # Usage tracker of the model shared by the components; needed to enforce a run budget
+        self.usage_tracker = usage_tracker
+        self.budget = None
+
+        # Number of refined directions explored in parallel per iteration; 1 is the linear chain
+        self.beam_width = max(1, self.config.get("beam_width", 1))
+
+        # Share of an iteration's queries after which the next iteration is planned speculatively
+        self.speculative_fraction = self.config.get("speculative_fraction")
+        self.speculative_change_threshold = self.config.get("speculative_change_threshold", 0.3)
+
+        # Search filters, so local relevance checks look at the field the backend searched
+        self.filters = SearchFilters.from_config(self.config)
+
+        # Split each iteration's paper budget across queries by expected yield instead of evenly
+        self.allocator = YieldAllocator(self.config) if self.config.get("yield_allocation", True) else None
+
+        # Keep a running report draft, updated after each iteration, so the final call only polishes it
+        self.incremental_report = self.config.get("incremental_report", False)
+        self.original_query = ""
+
         self.all_learnings = []
         self.all_sources = []
-    
+        self.research_iterations = []
+        self.run_summary = {}
+
+    def _notify(self, event, **data):
+        """Forward a progress event to the registered callback, if any."""
+        if self.progress_callback:
+            self.progress_callback(event, data)
+
     async def conduct_research(self, query, depth=3, breadth=3):
         """Conduct iterative research on a topic."""
-        original_query = query
-        current_context = f"Initial research query: {query}"
-        research_iterations = []
-        
+        original_query = self.original_query = query
+        research_iterations = self.research_iterations
+        current_breadth = breadth
+
+        # Each branch carries its own bounded research memory, rendered into the context of its
+        # prompts; the linear chain is a single branch per iteration
+        memory = ResearchMemory(query, self.config)
+        branches = [{
+            "id": "1",
+            "context": memory.render(),
+            "memory": memory,
+            "direction": "",
+            "score": 1.0
+        }]
+
+        novelty = NoveltyTracker(self.config) if self.config.get("adaptive_depth") else None
+        self.run_summary = {
+            "planned_depth": depth,
+            "iterations_run": 0,
+            "adaptive": novelty is not None,
+            "beam_width": self.beam_width,
+            "stopped_early": False,
+            "stop_reason": "",
+            "novelty": [],
+            "beam": [],
+            "speculation": [],
+            "allocation": []
+        }
+
+        usage = self.usage_tracker
+        budget = self.budget = RunBudget.from_config(self.config) if usage is not None else None
+        if usage is not None:
+            usage.reset()
+        if budget:
+            self.run_summary["budget"] = {"limits": budget.describe(), "actions": []}
+
+        # Draft updates run in the background, chained so each one sees the previous draft
+        draft_task = None
+        if self.incremental_report:
+            self.report_generator.reset_draft()
+
         for iteration in range(depth):
             print(f"Research iteration {iteration+1}/{depth}...")
-            
-            # Generate search queries
-            queries = await self.query_generator.generate_queries(current_context, breadth)
-            
-            iteration_results = {
-                "iteration": iteration + 1,
-                "context": current_context,
-                "queries": queries,
-                "findings": []
-            }
-            
-            # Process each query
-            for q in queries:
-                print(f"  Processing query: {q}")
-                try:
-                    search_results = await self.web_searcher.search(q)
-                    print(f"    Found {len(search_results)} papers from arXiv")
-                    
-                    if len(search_results) == 0:
-                        print(f"    WARNING: No results found for query: {q}")
-                        continue
-                    
-                    # Print the first result title for debugging
-                    if search_results:
-                        print(f"    First paper: {search_results[0].get('title', 'No title')}")
-                    
-                    # Fetch content for each result
-                    enriched_results = []
-                    for result in search_results[:breadth]:  # Limit to breadth parameter
-                        try:
-                            content = await self.web_searcher.fetch_content(result)
-                            enriched_results.append(content)
-                        except Exception as e:
-                            print(f"    Error fetching content: {e}")
-                    
-                    # Process the results
-                    processed = await self.content_processor.process_search_results(
-                        q, enriched_results, current_context
+            if usage is not None:
+                usage.set_iteration(iteration + 1)
+            self._notify("iteration_started", iteration=iteration + 1, depth=depth, breadth=current_breadth)
+
+            # Snapshot of what was known before this iteration, used to score beam branches
+            known_learnings = [tokenize(l) for l in self.all_learnings]
+            known_sources = set(self.all_sources)
+
+            # In the linear chain, refinement and query generation for the next iteration can start
+            # once part of this iteration's queries are done, instead of waiting for all of them
+            speculation = {}
+            on_partial = None
+            if self.speculative_fraction and self.beam_width == 1 and iteration < depth - 1:
+                on_partial = lambda partial: self._start_speculation(
+                    speculation, original_query, branches[0], partial, iteration, current_breadth
+                )
+
+            level_results = await asyncio.gather(
+                *(self._explore_branch(branch, iteration, current_breadth, on_partial) for branch in branches)
+            )
+
+            for branch, iteration_results in zip(branches, level_results):
+                research_iterations.append(iteration_results)
+                branch["memory"].record_iteration(iteration + 1, iteration_results["findings"])
+                self._notify("iteration_finished", iteration_data=iteration_results)
+                if self.beam_width > 1:
+                    branch["score"] = self._score_findings(
+                        iteration_results["findings"], known_learnings, known_sources
                     )
-                    
-                    self.all_learnings.extend(processed["learnings"])
-                    self.all_sources.extend(processed["sources"])
-                    
-                    iteration_results["findings"].append({
-                        "query": q,
-                        "learnings": processed["learnings"],
-                        "directions": processed["directions"],
-                        "sources": processed["sources"]
-                    })
-                except Exception as e:
-                    print(f"    ERROR processing query: {e}")
-            
-            research_iterations.append(iteration_results)
-            
+                    iteration_results["score"] = branch["score"]
+            self.run_summary["iterations_run"] = iteration + 1
+
+            level_findings = [f for r in level_results for f in r["findings"]]
+            if self.incremental_report:
+                draft_task = asyncio.create_task(
+                    self._update_draft(draft_task, iteration, [l for f in level_findings for l in f["learnings"]])
+                )
+
+            # In adaptive mode, stop or narrow the search once iterations stop adding new material
+            if novelty:
+                iteration_learnings = [l for f in level_findings for l in f["learnings"]]
+                iteration_sources = [s for f in level_findings for s in f["sources"]]
+                gain = novelty.measure(iteration_learnings, iteration_sources)
+                if iteration == depth - 1:
+                    decision = "final"
+                else:
+                    decision = novelty.decide(gain["gain"], iteration + 1)
+
+                if decision == "shrink":
+                    current_breadth = max(1, current_breadth - 1)
+
+                gain.update({"iteration": iteration + 1, "decision": decision, "next_breadth": current_breadth})
+                self.run_summary["novelty"].append(gain)
+                print(f"  Novelty gain {gain['gain']:.2f} "
+                      f"({gain['new_learnings']} new learnings, {gain['new_sources']} new sources): {decision}")
+                self._notify("novelty_measured", **gain)
+
+                if decision == "stop":
+                    self.run_summary["stopped_early"] = True
+                    self.run_summary["stop_reason"] = (
+                        f"novelty gain {gain['gain']:.2f} below threshold {novelty.stop_threshold:.2f} "
+                        f"after iteration {iteration + 1}"
+                    )
+                    print(f"Stopping early: {self.run_summary['stop_reason']}")
+                    await self._discard_speculation(speculation)
+                    break
+
             # If this is the last iteration, break
             if iteration == depth - 1:
                 break
-                
+
+            # With a budget, keep the reserve for the report and narrow the next iteration as it runs down
+            if budget:
+                if budget.reserved_for_report(usage):
+                    self.run_summary["stopped_early"] = True
+                    self.run_summary["stop_reason"] = f"run budget ({budget.describe()}) nearly exhausted"
+                    self._record_budget_action(f"ended research after iteration {iteration + 1}")
+                    await self._discard_speculation(speculation)
+                    break
+
+                scaled_breadth = budget.scaled_breadth(breadth, usage)
+                if scaled_breadth < current_breadth:
+                    self._record_budget_action(
+                        f"reduced breadth from {current_breadth} to {scaled_breadth} for iteration {iteration + 2}"
+                    )
+                    current_breadth = scaled_breadth
+
             # Otherwise, refine research direction
-            all_directions = []
-            for finding in iteration_results["findings"]:
-                all_directions.extend(finding["directions"])
-            
+            if self.beam_width > 1:
+                branches = await self._expand_beam(original_query, branches, level_results, iteration)
+            elif speculation:
+                branches = [await self._resolve_speculation(
+                    speculation, original_query, branches[0], level_results[0], iteration, current_breadth
+                )]
+            else:
+                branches = [await self._refine_branch(original_query, branches[0], level_results[0], iteration)]
+
+        # Generate final report
+        if usage is not None:
+            usage.set_iteration(0)
+        self._notify("generating_report", learning_count=len(self.all_learnings),
+                     iterations=self.run_summary["iterations_run"])
+        if self.incremental_report:
+            if draft_task:
+                await draft_task
+            report = await self.report_generator.polish_report(
+                original_query,
+                research_iterations,
+                self.all_learnings,
+                self.all_sources
+            )
+        else:
+            report = await self.report_generator.generate_report(
+                original_query,
+                research_iterations,
+                self.all_learnings,
+                self.all_sources
+            )
+
+        if usage is not None:
+            self.run_summary["usage"] = usage.summary()
+
+        return report
+
+    def partial_report(self):
+        """The report so far (the running draft, or the learnings gathered), for runs cut short."""
+        return self.report_generator.partial_report(self.original_query, self.all_learnings, self.all_sources)
+
+    async def _update_draft(self, previous, iteration, new_learnings):
+        """Fold one iteration's learnings into the report draft once the previous update has finished."""
+        if previous:
+            await previous
+        if not new_learnings:
+            return
+
+        try:
+            await self.report_generator.update_draft(self.original_query, iteration + 1, new_learnings)
+        except Exception as e:
+            print(f"  Report draft update failed ({e}); keeping the previous draft")
+            return
+
+        print(f"  Report draft updated with {len(new_learnings)} learnings from iteration {iteration + 1}")
+        self._notify("report_draft_updated", iteration=iteration + 1, report=self.partial_report())
+
+    async def _explore_branch(self, branch, iteration, breadth, on_partial=None):
+        """
+        Generate queries for one branch's context and process them; returns the iteration results.
+
+        If `on_partial` is given, it is called once with the partial iteration results as soon as
+        `speculative_fraction` of the queries have been processed.
+        """
+        current_context = branch["context"]
+
+        # Generate search queries, unless a speculative plan already produced them
+        queries = branch.get("queries")
+        if queries is None:
+            self._notify("generating_queries", iteration=iteration + 1, breadth=breadth)
+            queries = await self.query_generator.generate_queries(current_context, breadth)
+        queries = queries[:breadth]
+        self._notify("queries_generated", iteration=iteration + 1, queries=queries)
+
+        iteration_results = {
+            "iteration": iteration + 1,
+            "context": current_context,
+            "queries": queries,
+            "findings": []
+        }
+        if self.beam_width > 1:
+            iteration_results["branch"] = branch["id"]
+            iteration_results["direction"] = branch["direction"]
+
+        # Search every query before reading any paper, so papers can be allocated by expected yield
+        pool = breadth * self.allocator.pool_factor if self.allocator else breadth
+        searched = []
+        for query_index, q in enumerate(queries):
+            print(f"  Searching query: {q}")
+            self._notify("query_started", query=q, index=query_index + 1, total=len(queries))
+            searched.append((q, await self._search_query(q, pool)))
+
+        plan = self._allocate_papers(searched, breadth, current_context, iteration, branch)
+
+        # Read and extract the allocated papers, query by query
+        for query_index, (q, papers) in enumerate(plan):
+            if self.budget and query_index > 0 and self.budget.reserved_for_report(self.usage_tracker):
+                self._record_budget_action(
+                    f"skipped {len(plan) - query_index} queries in iteration {iteration + 1}"
+                )
+                break
+
+            print(f"  Processing query: {q}")
+            finding = await self._process_query(q, papers, current_context)
+            if finding:
+                iteration_results["findings"].append(finding)
+                branch["memory"].add_learnings(finding["learnings"])
+
+            done = query_index + 1
+            if on_partial and done < len(plan) and done >= self.speculative_fraction * len(plan):
+                on_partial(dict(iteration_results, findings=list(iteration_results["findings"])))
+                on_partial = None
+
+        return iteration_results
+
+    def _start_speculation(self, speculation, original_query, branch, partial_results, iteration, breadth):
+        """Plan the next iteration in the background from this iteration's partial findings."""
+        if self.budget and not self.budget.allows_refinement(self.usage_tracker):
+            return
+
+        print(f"  Speculatively planning iteration {iteration + 2} from "
+              f"{len(partial_results['findings'])} finished queries")
+        self._notify("speculation_started", iteration=iteration + 1,
+                     finished_queries=len(partial_results["findings"]))
+
+        async def plan():
+            child = await self._refine_branch(original_query, branch, partial_results, iteration)
+            # Refinement belongs to this iteration, the next iteration's queries to that one
+            if self.usage_tracker is not None:
+                self.usage_tracker.set_iteration(iteration + 2)
+            child["queries"] = await self.query_generator.generate_queries(child["context"], breadth)
+            return child
+
+        speculation["partial"] = partial_results
+        speculation["task"] = asyncio.create_task(plan())
+
+    async def _resolve_speculation(self, speculation, original_query, branch, iteration_results, iteration, breadth):
+        """
+        Keep the speculative plan unless the queries that finished after it started
+        added materially new learnings; in that case cancel it and plan again.
+        """
+        early = [l for f in speculation["partial"]["findings"] for l in f["learnings"]]
+        late = [l for f in iteration_results["findings"][len(speculation["partial"]["findings"]):]
+                for l in f["learnings"]]
+
+        early_tokens = [tokenize(l) for l in early]
+        novel_late = sum(1 for l in late if max_similarity(tokenize(l), early_tokens) < 0.6)
+        change = novel_late / max(1, len(early) + len(late))
+
+        if change < self.speculative_change_threshold:
+            try:
+                child = await speculation["task"]
+                self._record_speculation(iteration, "kept", change)
+
+                # Keep the plan, but carry over the memory as it stands after the whole iteration
+                kept = self._child_branch(branch, child, iteration, child["id"])
+                kept["queries"] = child["queries"]
+                return kept
+            except Exception as e:
+                print(f"  Speculative plan failed ({e}); planning again")
+        else:
+            await self._discard_speculation(speculation)
+
+        self._record_speculation(iteration, "regenerated", change)
+        return await self._refine_branch(original_query, branch, iteration_results, iteration)
+
+    async def _discard_speculation(self, speculation):
+        """Cancel a speculative plan, releasing any queries it generated for reuse."""
+        task = speculation.get("task")
+        if task is None:
+            return
+
+        if not task.done():
+            task.cancel()
+        # gather returns the task's own cancellation or error as a value, while a cancellation
+        # of this coroutine (e.g. a --timeout) still propagates
+        child, = await asyncio.gather(task, return_exceptions=True)
+        if isinstance(child, BaseException):
+            return
+        self.query_generator.forget_queries(child.get("queries", []))
+
+    def _record_speculation(self, iteration, outcome, change):
+        print(f"  Speculative plan for iteration {iteration + 2} {outcome} "
+              f"(late results changed {change:.0%} of learnings)")
+        self.run_summary["speculation"].append({
+            "iteration": iteration + 1,
+            "outcome": outcome,
+            "late_change": round(change, 3)
+        })
+        self._notify("speculation_resolved", iteration=iteration + 1, outcome=outcome, change=change)
+
+    async def _refine_branch(self, original_query, branch, iteration_results, iteration):
+        """Ask the refiner for the single next direction and build the next iteration's branch."""
+        all_directions = []
+        for finding in iteration_results["findings"]:
+            all_directions.extend(finding["directions"])
+
+        # Leave out suggestions that go back over directions this branch has already explored
+        memory = branch["memory"]
+        all_directions = memory.unexplored(all_directions) or all_directions
+
+        if self.budget and not self.budget.allows_refinement(self.usage_tracker):
+            # Skip the refiner call and follow the first direction the extraction step suggested
+            self._record_budget_action(f"skipped refinement after iteration {iteration + 1}")
+            refinement = {
+                "direction": all_directions[0] if all_directions else original_query,
+                "reasoning": "",
+                "goal": original_query
+            }
+        else:
+            self._notify("refining", next_iteration=iteration + 2, learning_count=len(self.all_learnings))
             refinement = await self.research_refiner.refine_research(
-                original_query, 
-                current_context,
-                self.all_learnings[-10:] if len(self.all_learnings) > 10 else self.all_learnings,
+                original_query,
+                memory.render(),
+                memory.top_learnings(),
                 all_directions
             )
-            
-            # Update context for next iteration
-            current_context = f"""
-            Original query: {original_query}
-            Current iteration: {iteration + 1}
-            Recent learnings: {', '.join(self.all_learnings[-5:])}
-            Next direction: {refinement['direction']}
-            Goal: {refinement['goal']}
-            """
-        
-        # Generate final report
-        report = await self.report_generator.generate_report(
-            original_query,
-            research_iterations,
-            self.all_learnings,
-            self.all_sources
+        self._notify("refined", refinement=refinement)
+
+        return self._child_branch(branch, refinement, iteration, branch["id"])
+
+    async def _expand_beam(self, original_query, branches, level_results, iteration):
+        """
+        Ask the refiner for the top directions of every branch, score the candidate
+        children by their parent's yield and the refiner's ranking, and keep the
+        best `beam_width` distinct ones.
+        """
+        skip_refinement = self.budget and not self.budget.allows_refinement(self.usage_tracker)
+        if skip_refinement:
+            self._record_budget_action(f"skipped refinement after iteration {iteration + 1}")
+        else:
+            self._notify("refining", next_iteration=iteration + 2, learning_count=len(self.all_learnings))
+
+        async def propose(branch, iteration_results):
+            memory = branch["memory"]
+            directions = [d for f in iteration_results["findings"] for d in f["directions"]]
+            directions = memory.unexplored(directions) or directions
+            if skip_refinement:
+                return [{"direction": d, "reasoning": "", "goal": original_query}
+                        for d in directions[:self.beam_width]]
+            return await self.research_refiner.propose_directions(
+                original_query, memory.render(), memory.top_learnings(), directions, self.beam_width
+            )
+
+        proposals = await asyncio.gather(
+            *(propose(branch, results) for branch, results in zip(branches, level_results))
         )
-        
-        return report
\ No newline at end of file
+
+        candidates = []
+        for branch, refinements in zip(branches, proposals):
+            for rank, refinement in enumerate(refinements):
+                # Later proposals of the same parent are discounted slightly
+                candidates.append((branch["score"] * (1 - 0.1 * rank), branch, refinement, rank))
+
+        candidates.sort(key=lambda c: c[0], reverse=True)
+
+        children = []
+        kept_directions = []
+        for score, branch, refinement, rank in candidates:
+            tokens = tokenize(refinement["direction"])
+            if not tokens or max_similarity(tokens, kept_directions) >= 0.8:
+                continue  # Empty or collapsed onto a kept direction; keep the beam diverse
+            if branch["memory"].is_explored(refinement["direction"], 0.8):
+                continue  # Goes back over ground this branch already covered
+            kept_directions.append(tokens)
+
+            child = self._child_branch(branch, refinement, iteration, f"{branch['id']}.{rank + 1}")
+            child["score"] = score
+            children.append(child)
+            if len(children) == self.beam_width:
+                break
+
+        # Fall back to continuing the best branch if the refiner proposed nothing usable
+        if not children:
+            best = max(branches, key=lambda b: b["score"])
+            fallback = {"direction": best["direction"] or original_query, "reasoning": "", "goal": original_query}
+            children = [self._child_branch(best, fallback, iteration, best["id"])]
+
+        pruned = len(candidates) - len(children)
+        self.run_summary["beam"].append({
+            "iteration": iteration + 1,
+            "branch_scores": {b["id"]: round(b["score"], 3) for b in branches},
+            "kept": [c["id"] for c in children],
+            "pruned": max(0, pruned)
+        })
+        print(f"  Beam: continuing {', '.join(c['id'] for c in children)}, pruned {max(0, pruned)} candidates")
+
+        for child in children:
+            self._notify("refined", refinement={"direction": child["direction"], "goal": child["goal"]})
+
+        return children
+
+    def _child_branch(self, parent, refinement, iteration, branch_id):
+        """Build the branch for the next iteration from a refinement of its parent."""
+        memory = parent["memory"].fork()
+        memory.explore(refinement["direction"], refinement["goal"], iteration + 2)
+        return {
+            "id": branch_id,
+            "direction": refinement["direction"],
+            "goal": refinement["goal"],
+            "score": parent["score"],
+            "memory": memory,
+            # Context for the next iteration, rendered from the bounded memory
+            "context": memory.render()
+        }
+
+    def _allocate_papers(self, searched, breadth, context, iteration, branch):
+        """
+        Choose the papers to read for each query; returns [(query, papers)] without the dropped queries.
+
+        With the yield allocator, the iteration's budget of `breadth` papers per query goes to the
+        queries whose hits look most relevant and new; otherwise every query keeps its top `breadth` hits.
+        """
+        if not self.allocator:
+            plan = [(q, hits[:breadth]) for q, hits in searched if hits]
+        else:
+            scored = self.allocator.score(searched, context, set(self.all_sources))
+            # Papers beyond what one extraction prompt holds would be listed as sources without being read
+            max_per_query = min(breadth * self.allocator.pool_factor, self.content_processor.excerpt_capacity())
+            allocation = self.allocator.allocate(scored, breadth * len(searched), max_per_query)
+            plan = [(q, papers) for q, papers in allocation if papers]
+
+            record = {
+                "iteration": iteration + 1,
+                "queries": {
+                    q: {"hits": len(hits), "yield": round(self.allocator.expected_yield(entries), 2),
+                        "papers": len(papers)}
+                    for (q, hits), (_, entries), (_, papers) in zip(searched, scored, allocation)
+                }
+            }
+            if self.beam_width > 1:
+                record["branch"] = branch["id"]
+            self.run_summary["allocation"].append(record)
+
+            print("  Paper allocation: " + ", ".join(
+                f"'{q}' {stats['papers']} (yield {stats['yield']:.2f})" for q, stats in record["queries"].items()
+            ))
+            for q, papers in allocation:
+                if not papers:
+                    print(f"    Dropping query with no new relevant papers: {q}")
+                    self._notify("query_dropped", query=q)
+
+        self._notify("papers_allocated", iteration=iteration + 1, allocation=plan)
+        return plan
+
+    def _score_findings(self, findings, known_learnings, known_sources):
+        """Yield of a branch: its learnings and sources that were not known before the iteration."""
+        new_learnings = 0
+        seen = list(known_learnings)
+        for learning in (l for f in findings for l in f["learnings"]):
+            tokens = tokenize(learning)
+            if tokens and max_similarity(tokens, seen) < 0.6:
+                new_learnings += 1
+            seen.append(tokens)
+
+        new_sources = len(set(s for f in findings for s in f["sources"]) - known_sources)
+        return new_learnings + 0.5 * new_sources
+
+    async def _search_query(self, q, limit):
+        """Search one query for up to `limit` relevant papers; returns the hits, or [] on error."""
+        try:
+            search_results = await self._stream_search(q, limit)
+        except Exception as e:
+            print(f"    ERROR searching query: {e}")
+            self._notify("query_error", query=q, error=str(e))
+            return []
+
+        print(f"    Found {len(search_results)} papers from arXiv")
+        self._notify("search_results", query=q, results=search_results)
+
+        if len(search_results) == 0:
+            print(f"    WARNING: No results found for query: {q}")
+        else:
+            # Print the first result title for debugging
+            print(f"    First paper: {search_results[0].get('title', 'No title')}")
+
+        return search_results
+
+    async def _process_query(self, q, selected, context):
+        """Fetch the papers selected for one query and extract learnings; returns the finding or None."""
+        try:
+            # Fetch content for each result
+            enriched_results = []
+            for paper_index, result in enumerate(selected):
+                self._notify("paper_started", query=q, index=paper_index + 1,
+                             total=len(selected), paper=result)
+                try:
+                    content = await self.web_searcher.fetch_content(result)
+                    enriched_results.append(content)
+                except Exception as e:
+                    print(f"    Error fetching content: {e}")
+                    self._notify("paper_error", query=q, error=str(e))
+
+            # Process the results
+            self._notify("query_processing", query=q, paper_count=len(enriched_results))
+            processed = await self.content_processor.process_search_results(
+                q, enriched_results, context
+            )
+
+            self.all_learnings.extend(processed["learnings"])
+            self.all_sources.extend(processed["sources"])
+            self._notify("query_processed", query=q, processed=processed)
+
+            return {
+                "query": q,
+                "learnings": processed["learnings"],
+                "directions": processed["directions"],
+                "sources": processed["sources"]
+            }
+        except Exception as e:
+            print(f"    ERROR processing query: {e}")
+            self._notify("query_error", query=q, error=str(e))
+            return None
+
+    async def _stream_search(self, q, breadth):
+        """
+        Consume the search stream until `breadth` papers whose searched field shares a term
+        with the query have arrived, so later result pages are never fetched. Those papers are moved
+        to the front of the returned list, ahead of the off-topic ones.
+        """
+        query_tokens = set(tokenize(q))
+        relevant, other = [], []
+
+        async with contextlib.aclosing(self.web_searcher.search_stream(q)) as stream:
+            async for paper in stream:
+                paper_tokens = set(tokenize(self.filters.searched_text(paper)))
+                if not query_tokens or query_tokens & paper_tokens:
+                    relevant.append(paper)
+                else:
+                    other.append(paper)
+                if len(relevant) >= breadth:
+                    break
+
+        return relevant + other
+
+    def _record_budget_action(self, action):
+        """Log a budget-driven degradation and keep it in the run summary."""
+        print(f"  Budget: {action}")
+        self.run_summary["budget"]["actions"].append(action)
+        self._notify("budget_action", action=action)
@@ -0,0 +1,91 @@
+import json
+import re
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+
+class ExtractionStore:
+    """
+    Persistent per-paper extraction results, shared across research runs.
+
+    Each record holds the context-independent findings and open questions
+    extracted once from a paper, keyed by the paper (arXiv ID without version
+    suffix, or URL for non-arXiv sources) and the extraction prompt version, so
+    changing the prompt invalidates old records instead of mixing them in.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript("""
+            PRAGMA journal_mode=WAL;
+
+            CREATE TABLE IF NOT EXISTS extractions (
+                paper_key TEXT NOT NULL,
+                prompt_version TEXT NOT NULL,
+                title TEXT,
+                learnings TEXT NOT NULL,
+                questions TEXT NOT NULL,
+                model TEXT,
+                created TEXT,
+                PRIMARY KEY (paper_key, prompt_version)
+            );
+        """)
+
+    def close(self):
+        self.conn.close()
+
+    @staticmethod
+    def paper_key(paper):
+        """Identity of a paper across runs: arXiv ID without version, else its URL."""
+        arxiv_id = (paper.get("arxiv_id") or "").strip()
+        if arxiv_id:
+            return re.sub(r"v\d+$", "", arxiv_id)
+        return paper.get("url", "")
+
+    def get_many(self, keys, prompt_version):
+        """Return {paper_key: {"title", "learnings", "questions"}} for the stored keys among `keys`."""
+        keys = [k for k in keys if k]
+        if not keys:
+            return {}
+
+        placeholders = ", ".join("?" for _ in keys)
+        rows = self.conn.execute(
+            f"SELECT paper_key, title, learnings, questions FROM extractions "
+            f"WHERE prompt_version = ? AND paper_key IN ({placeholders})",
+            [prompt_version] + keys
+        ).fetchall()
+
+        return {
+            row["paper_key"]: {
+                "title": row["title"],
+                "learnings": json.loads(row["learnings"]),
+                "questions": json.loads(row["questions"])
+            }
+            for row in rows
+        }
+
+    def put_many(self, extractions, prompt_version, model=""):
+        """Store {paper_key: {"title", "learnings", "questions"}}, replacing older records for the same version."""
+        created = datetime.now().isoformat(timespec="seconds")
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO extractions "
+                "(paper_key, prompt_version, title, learnings, questions, model, created) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (key, prompt_version, e.get("title", ""), json.dumps(e["learnings"]),
+                     json.dumps(e["questions"]), model, created)
+                    for key, e in extractions.items() if key
+                ]
+            )
+
+    def count(self, prompt_version=None):
+        if prompt_version is None:
+            return self.conn.execute("SELECT COUNT(*) FROM extractions").fetchone()[0]
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM extractions WHERE prompt_version = ?", (prompt_version,)
+        ).fetchone()[0]
@@ -0,0 +1,70 @@
+from research.text_similarity import tokenize, max_similarity
+
+
+class NoveltyTracker:
+    """
+    Measures how much each research iteration adds to what is already known,
+    using local token similarity only (no LLM calls), and decides whether the
+    next iteration is worth running at full breadth.
+    """
+
+    def __init__(self, config):
+        # A learning this similar to a known one counts as a repeat
+        self.duplicate_similarity = config.get("novelty_duplicate_similarity", 0.6)
+        # Below this gain the run stops; below the shrink threshold breadth is reduced
+        self.stop_threshold = config.get("novelty_stop_threshold", 0.15)
+        self.shrink_threshold = config.get("novelty_shrink_threshold", 0.35)
+        self.min_iterations = config.get("novelty_min_iterations", 2)
+        self.learning_weight = config.get("novelty_learning_weight", 0.7)
+
+        self.known_learnings = []
+        self.known_sources = set()
+
+    def measure(self, learnings, sources):
+        """
+        Score the novelty of one iteration's output against everything seen before,
+        then add it to the known set.
+
+        Returns a dict with the fraction of new learnings, the fraction of new
+        sources and their weighted combination as `gain`.
+        """
+        new_learnings = 0
+        batch = []
+        for learning in learnings:
+            tokens = tokenize(learning)
+            if not tokens:
+                continue
+            # Compare against earlier iterations and against this iteration's own repeats
+            if max_similarity(tokens, self.known_learnings + batch) < self.duplicate_similarity:
+                new_learnings += 1
+            batch.append(tokens)
+
+        unique_sources = set(s for s in sources if s)
+        new_sources = unique_sources - self.known_sources
+
+        learning_novelty = new_learnings / len(batch) if batch else 0.0
+        source_novelty = len(new_sources) / len(unique_sources) if unique_sources else 0.0
+
+        self.known_learnings.extend(batch)
+        self.known_sources |= unique_sources
+
+        return {
+            "learning_novelty": round(learning_novelty, 3),
+            "source_novelty": round(source_novelty, 3),
+            "new_learnings": new_learnings,
+            "new_sources": len(new_sources),
+            "gain": round(
+                self.learning_weight * learning_novelty
+                + (1 - self.learning_weight) * source_novelty, 3
+            )
+        }
+
+    def decide(self, gain, iterations_done):
+        """Return "stop", "shrink" or "continue" for the iteration after this one."""
+        if iterations_done < self.min_iterations:
+            return "continue"
+        if gain < self.stop_threshold:
+            return "stop"
+        if gain < self.shrink_threshold:
+            return "shrink"
+        return "continue"
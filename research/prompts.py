@@ -0,0 +1,204 @@
+import textwrap
+
+
+class PromptTemplate:
+    """
+    A prompt split into a static prefix and a variable payload.
+
+    Providers such as Fireworks and OpenAI cache repeated prompt prefixes, so
+    every template puts its instructions and format rules first, with
+    indentation stripped, and appends the per-call values last as labelled
+    sections in a fixed order.
+    """
+
+    def __init__(self, name, instructions, sections, version=1):
+        self.name = name
+        self.instructions = textwrap.dedent(instructions).strip()
+        self.sections = sections  # (LABEL, value key) pairs, rendered in this order
+        self.version = version  # Bump when a change should invalidate stored outputs of this prompt
+
+    @property
+    def key(self):
+        return f"{self.name}/v{self.version}"
+
+    def render(self, **values):
+        parts = [self.instructions]
+        for label, key in self.sections:
+            value = values.get(key)
+            if value is None or value == "":
+                continue
+            parts.append(f"{label}:\n{normalize_whitespace(value)}")
+        return "\n\n".join(parts)
+
+
+def normalize_whitespace(value):
+    """Strip the indentation that f-strings and string building leave in payload values."""
+    lines = [line.strip() for line in str(value).strip().splitlines()]
+    return "\n".join(lines)
+
+
+PROMPT_REGISTRY = {}
+
+
+def register(template):
+    PROMPT_REGISTRY[template.name] = template
+    return template
+
+
+def render_prompt(name, **values):
+    """Render a registered template with its variable payload."""
+    return PROMPT_REGISTRY[name].render(**values)
+
+
+register(PromptTemplate(
+    "query_generation",
+    """
+    You generate specific search queries for finding academic papers on arXiv, based on a research
+    context. Queries should be concise search terms without any formatting, explanations, or special
+    characters. Generate exactly the number of queries requested below and do not repeat or rephrase
+    any query listed as already searched.
+
+    GUIDELINES FOR ARXIV SEARCH QUERIES:
+    1. Keep queries short and focused (3-7 words)
+    2. Use quotes for exact phrases, e.g., "quantum computing"
+    3. No asterisks, bolding, or other formatting
+    4. No explanations or descriptions
+    5. Use standard arXiv search operators like AND, OR when needed
+    6. Focus on technical scientific terms that would appear in academic papers
+
+    EXAMPLE GOOD QUERIES:
+    - quantum computing algorithms
+    - "neural networks" AND optimization
+    - transformer attention mechanisms
+    """,
+    [
+        ("SEARCH FILTERS", "filters"),  # Fixed for the run, so it stays in the cached prefix
+        ("NUMBER OF QUERIES", "count"),
+        ("ALREADY SEARCHED", "previous_queries"),
+        ("RESEARCH CONTEXT", "context"),
+    ]
+))
+
+register(PromptTemplate(
+    "content_extraction",
+    """
+    You analyse arXiv search results for a research query. Based on the search results and the
+    current research context, identify:
+    1. Key learnings and facts that address the research goals
+    2. New research directions or questions to explore further
+    """,
+    [
+        ("QUERY", "query"),
+        ("CURRENT RESEARCH CONTEXT", "context"),
+        ("SEARCH RESULTS", "results"),
+    ]
+))
+
+register(PromptTemplate(
+    "paper_extraction",
+    """
+    You read arXiv paper abstracts and record what each paper contributes, independently of any
+    particular research question, so the notes can be reused for future research on other topics.
+    For every paper below, list:
+    1. Its key findings and facts as short self-contained statements (name the method, system or
+       dataset instead of writing "this paper" or "the authors")
+    2. Open questions or follow-up directions it raises
+
+    Return one entry per paper, using the paper ID exactly as given.
+    """,
+    [
+        ("PAPERS", "papers"),
+    ]
+))
+
+register(PromptTemplate(
+    "research_refinement",
+    """
+    Based on the original research query, current context, and recent findings, determine the most
+    promising direction to continue this research.
+    """,
+    [
+        ("ORIGINAL QUERY", "original_query"),
+        ("CURRENT RESEARCH CONTEXT", "context"),
+        ("KEY LEARNINGS SO FAR", "learnings"),
+        ("POSSIBLE NEXT DIRECTIONS", "directions"),
+    ]
+))
+
+register(PromptTemplate(
+    "research_beam_refinement",
+    """
+    Based on the original research query, current context, and recent findings, propose the most
+    promising directions to continue this research, best first. The directions will be explored in
+    parallel, so make them clearly distinct from each other rather than rephrasings of one idea.
+    Propose exactly the number of directions requested below.
+    """,
+    [
+        ("NUMBER OF DIRECTIONS", "count"),
+        ("ORIGINAL QUERY", "original_query"),
+        ("CURRENT RESEARCH CONTEXT", "context"),
+        ("KEY LEARNINGS SO FAR", "learnings"),
+        ("POSSIBLE NEXT DIRECTIONS", "directions"),
+    ]
+))
+
+register(PromptTemplate(
+    "report_generation",
+    """
+    Create a comprehensive research report in markdown format based on the research described below.
+
+    Generate a well-structured markdown report with the following sections:
+    1. Executive Summary
+    2. Key Findings
+    3. Detailed Analysis
+    4. Conclusions
+    5. References
+
+    Make the report informative, factual, and focused on the most important discoveries.
+    """,
+    [
+        ("RESEARCH QUERY", "original_query"),
+        ("RESEARCH CONTEXT", "context"),
+        ("KEY LEARNINGS", "learnings"),
+    ]
+))
+
+register(PromptTemplate(
+    "report_update",
+    """
+    You maintain a running markdown research report that is updated after every research iteration.
+    Revise the current draft below so that it incorporates the new learnings, and return the complete
+    updated draft in markdown and nothing else.
+
+    Keep these sections:
+    1. Executive Summary
+    2. Key Findings
+    3. Detailed Analysis
+    4. Conclusions
+
+    Preserve what the draft already says unless the new learnings correct it, merge overlapping points
+    instead of repeating them, and keep the draft concise. Do not add a references section; it is
+    generated separately.
+    """,
+    [
+        ("RESEARCH QUERY", "original_query"),
+        ("ITERATION", "iteration"),
+        ("CURRENT DRAFT", "draft"),
+        ("NEW LEARNINGS", "learnings"),
+    ]
+))
+
+register(PromptTemplate(
+    "report_polish",
+    """
+    Below is a markdown research report draft that was built up over several research iterations.
+    Polish it into the final report: make the sections read as one coherent document, remove
+    repetition, and tighten the wording. Keep every factual finding and the section structure
+    (Executive Summary, Key Findings, Detailed Analysis, Conclusions). Do not add new claims or a
+    references section. Return only the final markdown report.
+    """,
+    [
+        ("RESEARCH QUERY", "original_query"),
+        ("DRAFT", "draft"),
+    ]
+))
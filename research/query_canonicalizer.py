@@ -0,0 +1,50 @@
+import re
+from research.text_similarity import tokenize, jaccard_similarity
+
+# Common abbreviations mapped to their expanded form, so "LLM" and "large language models" compare equal
+SYNONYMS = {
+    "llm": "large language model",
+    "llms": "large language models",
+    "nlp": "natural language processing",
+    "rl": "reinforcement learning",
+    "gnn": "graph neural network",
+    "cnn": "convolutional neural network",
+    "rnn": "recurrent neural network",
+    "nn": "neural network",
+    "ml": "machine learning",
+    "dl": "deep learning",
+    "ai": "artificial intelligence",
+    "cv": "computer vision",
+    "gan": "generative adversarial network",
+    "vae": "variational autoencoder",
+    "rag": "retrieval augmented generation",
+    "qc": "quantum computing",
+}
+
+
+def query_tokens(query):
+    """Canonical token list of a query: formatting, quotes, boolean operators and stop words removed."""
+    text = re.sub(r"\b(AND|OR|NOT|ANDNOT)\b", " ", query.replace("**", ""))
+    expanded = [SYNONYMS.get(word.lower(), word) for word in re.findall(r"[\w-]+", text)]
+    return sorted(set(tokenize(" ".join(expanded).replace("-", " "))))
+
+
+def canonicalize_query(query):
+    """
+    Canonical form of a search query.
+
+    OR-alternatives are canonicalised separately and sorted, and within each
+    alternative the terms are normalised and sorted, so queries that differ only
+    in quoting, word order, operator placement or common abbreviations share
+    one form.
+    """
+    alternatives = re.split(r"\bOR\b", query.replace("**", ""))
+    canonical = sorted(set(" ".join(query_tokens(alt)) for alt in alternatives))
+    return " | ".join(alt for alt in canonical if alt)
+
+
+def query_similarity(query_a, query_b):
+    """Similarity of two queries in [0, 1] based on their canonical terms."""
+    if canonicalize_query(query_a) == canonicalize_query(query_b):
+        return 1.0
+    return jaccard_similarity(query_tokens(query_a), query_tokens(query_b))
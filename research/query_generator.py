@@ -1,51 +1,96 @@
+from research.prompts import render_prompt
+from research.query_canonicalizer import canonicalize_query, query_similarity
+from research.search_filters import SearchFilters
+
 class QueryGenerator:
-    def __init__(self, model_interface):
+    SCHEMA = {
+        "type": "object",
+        "properties": {
+            "queries": {
+                "type": "array",
+                "items": {"type": "string", "minLength": 1},
+                "minItems": 1,
+                "description": "the search queries, one string each"
+            }
+        },
+        "required": ["queries"]
+    }
+    
+    def __init__(self, model_interface, config=None):
         self.model = model_interface
+        self.config = config or {}
+        
+        # Queries already returned in this run; near-repeats of these are filtered out
+        self.issued_queries = []
+        self.similarity_threshold = self.config.get("query_dedup_similarity", 0.6)
+        self.overgeneration = self.config.get("query_overgeneration", 2)
+        
+        # Category/date/field filters applied by the search backend, described to the model
+        self.filters = SearchFilters.from_config(self.config)
     
     async def generate_queries(self, context, breadth=3):
         """Generate search queries based on research context."""
-        prompt = f"""
-        Based on the following research context, generate {breadth} specific search queries 
-        for searching academic papers on arXiv. These should be concise search terms without any 
-        formatting, explanations, or special characters.
-
-        RESEARCH CONTEXT:
-        {context}
-        
-        GUIDELINES FOR ARXIV SEARCH QUERIES:
-        1. Keep queries short and focused (3-7 words)
-        2. Use quotes for exact phrases, e.g., "quantum computing"
-        3. No asterisks, bolding, or other formatting 
-        4. No explanations or descriptions
-        5. Use standard arXiv search operators like AND, OR when needed
-        6. Focus on technical scientific terms that would appear in academic papers
-        
-        EXAMPLE GOOD QUERIES:
-        - quantum computing algorithms
-        - "neural networks" AND optimization
-        - transformer attention mechanisms
-        
-        OUTPUT FORMAT:
-        1. [First search query]
-        2. [Second search query]
-        ...
-        """
-        
-        response = await self.model.generate(prompt)
-        
-        # Parse response into list of queries
+        # Ask for a few spare queries so near-repeats can be replaced without another call
+        requested = breadth + self.overgeneration if self.issued_queries else breadth
+        
+        prompt = render_prompt(
+            "query_generation",
+            filters=self.filters.describe(),
+            count=requested,
+            previous_queries="\n".join(f"- {q}" for q in self.issued_queries[-15:]),
+            context=context
+        )
+        
+        response = await self.model.generate_structured(prompt, self.SCHEMA, stage="query_generation")
+        
         queries = []
-        for line in response.split("\n"):
-            if line.strip() and (line.strip()[0].isdigit() and ". " in line):
-                query = line.split(". ", 1)[1].strip()
-                # Remove any remaining markdown formatting or explanations
-                if "**" in query:
-                    query = query.replace("**", "")
-                if ":" in query:
-                    # Take only what's before the colon if it's an explanation
-                    parts = query.split(":", 1)
-                    if len(parts[0].split()) < 8:  # If first part is short, it's likely a label
-                        query = parts[1].strip()
+        for query in response["queries"]:
+            # Remove any remaining markdown formatting or explanations
+            if "**" in query:
+                query = query.replace("**", "")
+            if ":" in query:
+                # Take only what's before the colon if it's an explanation
+                parts = query.split(":", 1)
+                if len(parts[0].split()) < 8:  # If first part is short, it's likely a label
+                    query = parts[1].strip()
+            if query:
                 queries.append(query)
         
-        return queries[:breadth]  # Ensure we only return the requested number
\ No newline at end of file
+        queries = self._filter_repeats(queries)[:breadth]  # Ensure we only return the requested number
+        self.issued_queries.extend(queries)
+        
+        return queries
+    
+    def _filter_repeats(self, queries):
+        """Drop queries that are near-repeats of one already issued in this run or earlier in the batch."""
+        accepted = []
+        seen_forms = set(canonicalize_query(q) for q in self.issued_queries)
+        
+        for query in queries:
+            form = canonicalize_query(query)
+            if not form:
+                continue
+            
+            duplicate_of = None
+            if form in seen_forms:
+                duplicate_of = "an identical query"
+            else:
+                for previous in self.issued_queries + accepted:
+                    if query_similarity(query, previous) >= self.similarity_threshold:
+                        duplicate_of = f"'{previous}'"
+                        break
+            
+            if duplicate_of:
+                print(f"    Skipping query '{query}': near-repeat of {duplicate_of}")
+                continue
+            
+            accepted.append(query)
+            seen_forms.add(form)
+        
+        return accepted
+    
+    def forget_queries(self, queries):
+        """Remove queries that were generated but never searched, so they can be proposed again."""
+        for query in queries:
+            if query in self.issued_queries:
+                self.issued_queries.remove(query)
@@ -1,6 +1,11 @@
+from research.prompts import render_prompt
+
 class ReportGenerator:
     def __init__(self, model_interface):
         self.model = model_interface
+        
+        # Running markdown draft kept up to date after each iteration in incremental mode
+        self.draft = ""
     
     async def generate_report(self, original_query, research_iterations, all_learnings, all_sources):
         """Generate a comprehensive markdown report of research findings."""
@@ -9,6 +14,8 @@ class ReportGenerator:
         
         for iteration in research_iterations:
             summary = f"## Iteration {iteration['iteration']}\n\n"
+            if iteration.get('branch'):
+                summary += f"### Branch {iteration['branch']}: {iteration['direction']}\n\n"
             summary += f"### Context\n{iteration['context']}\n\n"
             summary += f"### Queries\n"
             
@@ -35,8 +42,10 @@ class ReportGenerator:
         Original research query: {original_query}
         
         Summary of iterations:
-        {', '.join([f"Iteration {i+1}: {len(iter['findings'])} queries processed" 
-                   for i, iter in enumerate(research_iterations)])}
+        {', '.join([f"Iteration {iter['iteration']}"
+                    + (f" (branch {iter['branch']})" if iter.get('branch') else "")
+                    + f": {len(iter['findings'])} queries processed"
+                   for iter in research_iterations])}
         
         Total unique sources: {len(unique_sources)}
         Total learnings: {len(all_learnings)}
@@ -46,31 +55,76 @@ class ReportGenerator:
         learning_samples = all_learnings[:50] if len(all_learnings) > 50 else all_learnings
         learning_text = "\n".join([f"- {l}" for l in learning_samples])
         
-        prompt = f"""
-        Create a comprehensive research report in markdown format based on the following research.
-        
-        RESEARCH QUERY:
-        {original_query}
+        prompt = render_prompt(
+            "report_generation",
+            original_query=original_query,
+            context=context,
+            learnings=learning_text
+        )
         
-        RESEARCH CONTEXT:
-        {context}
+        report_content = await self.model.generate(prompt, stage="report_generation")
         
-        KEY LEARNINGS:
-        {learning_text}
-        
-        Generate a well-structured markdown report with the following sections:
-        1. Executive Summary
-        2. Key Findings
-        3. Detailed Analysis
-        4. Conclusions
-        5. References
+        # Add source list to the report
+        final_report = report_content + self._sources_section(unique_sources)
         
-        Make the report informative, factual, and focused on the most important discoveries.
+        return final_report
+    
+    def reset_draft(self):
+        self.draft = ""
+    
+    async def update_draft(self, original_query, iteration, new_learnings):
+        """
+        Fold one iteration's new learnings into the running draft with a small delta
+        prompt: the model sees the current draft and only the learnings added since.
         """
+        learning_text = "\n".join([f"- {l}" for l in new_learnings])
         
-        report_content = await self.model.generate(prompt)
+        prompt = render_prompt(
+            "report_update",
+            original_query=original_query,
+            iteration=iteration,
+            draft=self.draft or "(empty - this is the first iteration)",
+            learnings=learning_text
+        )
         
-        # Add source list to the report
+        draft = await self.model.generate(prompt, stage="report_update")
+        if draft and draft.strip():
+            self.draft = draft.strip()
+        
+        return self.draft
+    
+    async def polish_report(self, original_query, research_iterations, all_learnings, all_sources):
+        """Turn the running draft into the final report; falls back to a full report without a draft."""
+        if not self.draft:
+            return await self.generate_report(original_query, research_iterations, all_learnings, all_sources)
+        
+        prompt = render_prompt(
+            "report_polish",
+            original_query=original_query,
+            draft=self.draft
+        )
+        
+        report_content = await self.model.generate(prompt, stage="report_polish")
+        if not report_content or not report_content.strip():
+            report_content = self.draft
+        
+        return report_content + self._sources_section(self._unique(all_sources))
+    
+    def partial_report(self, original_query, all_learnings, all_sources):
+        """The report as far as it has got, without any LLM call; usable when a run is cut short."""
+        if self.draft:
+            body = self.draft
+        else:
+            body = f"# Research Report (partial): {original_query}\n\n## Key Findings\n\n"
+            body += "\n".join([f"- {l}" for l in all_learnings]) or "No findings yet."
+        
+        return body + self._sources_section(self._unique(all_sources))
+    
+    def _unique(self, sources):
+        """Sources deduplicated in the order they were found."""
+        return list(dict.fromkeys(sources))
+    
+    def _sources_section(self, unique_sources):
         sources_section = "\n\n## Sources\n\n"
         for i, source in enumerate(unique_sources[:30]):  # Limit to first 30 sources
             sources_section += f"{i+1}. [{source}]({source})\n"
@@ -78,6 +132,4 @@ class ReportGenerator:
         if len(unique_sources) > 30:
             sources_section += f"\n... and {len(unique_sources) - 30} more sources"
         
-        final_report = report_content + sources_section
-        
-        return final_report
\ No newline at end of file
+        return sources_section
\ No newline at end of file
@@ -0,0 +1,131 @@
+import copy
+from research.text_similarity import tokenize, max_similarity, query_coverage
+
+
+class ResearchMemory:
+    """
+    Bounded research state that replaces the per-iteration context string.
+
+    It holds a compact running summary (one digest line per iteration, older
+    lines folded into a single total), the top-k learnings ranked by how much
+    of the original query and current direction they cover, and the directions
+    already explored.
+    Every part has a fixed size, so prompts built from `render()` stay the
+    same size however deep the research goes. It is updated incrementally as
+    findings arrive; nothing is re-summarised by the model.
+    """
+
+    def __init__(self, original_query, config=None):
+        config = config or {}
+        self.original_query = original_query
+        self.query_tokens = tokenize(original_query)
+
+        self.max_learnings = config.get("memory_max_learnings", 8)
+        self.max_directions = config.get("memory_max_directions", 10)
+        self.summary_lines = config.get("memory_summary_lines", 4)
+        self.item_chars = config.get("memory_item_chars", 300)
+        self.duplicate_similarity = config.get("novelty_duplicate_similarity", 0.6)
+
+        self.iteration = 1
+        self.direction = ""
+        self.goal = ""
+        self.learnings = []  # [(relevance, order, text, tokens)], best first
+        self.explored = []  # directions already explored, oldest first
+        self.digests = []  # one summary line per finished iteration
+        self.folded = {"iterations": 0, "findings": 0}  # iterations dropped from `digests`
+        self._order = 0
+
+    def fork(self):
+        """Independent copy for a child branch."""
+        return copy.deepcopy(self)
+
+    def add_learnings(self, learnings):
+        """Rank new learnings against the original query and direction and keep the best `max_learnings`."""
+        direction_tokens = tokenize(self.direction)
+        for text in learnings:
+            tokens = tokenize(text)
+            if not tokens or max_similarity(tokens, [l[3] for l in self.learnings]) >= self.duplicate_similarity:
+                continue
+            self._order += 1
+            score = query_coverage(tokens, self.query_tokens, direction_tokens)
+            self.learnings.append((score, self._order, text, tokens))
+
+        self._rank()
+
+    def _rank(self):
+        # Most relevant first; among equals, the most recent
+        self.learnings.sort(key=lambda l: (l[0], l[1]), reverse=True)
+        del self.learnings[self.max_learnings:]
+
+    def record_iteration(self, iteration, findings):
+        """Add a one-line digest of a finished iteration to the running summary."""
+        learnings = [l for f in findings for l in f["learnings"]]
+        best = max(learnings, key=lambda l: query_coverage(tokenize(l), self.query_tokens), default="")
+
+        line = f"Iteration {iteration}"
+        if self.direction:
+            line += f" ({self._clip(self.direction)})"
+        line += f": {len(findings)} queries, {len(learnings)} findings"
+        if best:
+            line += f"; strongest: {self._clip(best)}"
+        self.digests.append((line, len(learnings)))
+
+        while len(self.digests) > self.summary_lines:
+            _, count = self.digests.pop(0)
+            self.folded["iterations"] += 1
+            self.folded["findings"] += count
+
+    def explore(self, direction, goal, iteration):
+        """Move on to a new direction; the current one joins the explored list."""
+        if self.direction:
+            self.explored.append(self._clip(self.direction))
+            del self.explored[:-self.max_directions]
+        self.direction = direction
+        self.goal = goal
+        self.iteration = iteration
+
+        # Kept learnings were scored against the old direction
+        direction_tokens = tokenize(direction)
+        self.learnings = [(query_coverage(tokens, self.query_tokens, direction_tokens), order, text, tokens)
+                          for _, order, text, tokens in self.learnings]
+        self._rank()
+
+    def is_explored(self, direction, threshold=0.6):
+        """True if a direction repeats the current or an already explored one."""
+        tokens = tokenize(direction)
+        known = [tokenize(d) for d in self.explored + [self.direction] if d]
+        return bool(tokens) and max_similarity(tokens, known) >= threshold
+
+    def unexplored(self, directions):
+        """Candidate directions minus those that repeat explored ground."""
+        return [d for d in directions if not self.is_explored(d)]
+
+    def top_learnings(self):
+        return [l[2] for l in self.learnings]
+
+    def render(self):
+        """The context passed to the query generator, extractor and refiner."""
+        parts = [f"Original query: {self.original_query}", f"Current iteration: {self.iteration}"]
+        if self.direction:
+            parts.append(f"Current direction: {self.direction}")
+        if self.goal:
+            parts.append(f"Goal: {self.goal}")
+
+        summary = [line for line, _ in self.digests]
+        if self.folded["iterations"]:
+            summary.insert(0, f"Iterations 1-{self.folded['iterations']}: {self.folded['findings']} findings")
+        if summary:
+            parts.append("Progress so far:\n" + "\n".join(f"- {line}" for line in summary))
+
+        if self.learnings:
+            parts.append("Most relevant learnings:\n" + "\n".join(f"- {self._clip(l[2])}" for l in self.learnings))
+
+        if self.explored:
+            parts.append("Directions already explored (do not revisit):\n"
+                         + "\n".join(f"- {d}" for d in self.explored))
+
+        return "\n".join(parts)
+
+    def _clip(self, text):
+        text = " ".join(str(text).split())
+        return text if len(text) <= self.item_chars else text[:self.item_chars - 3].rstrip() + "..."
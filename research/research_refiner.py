@@ -1,48 +1,84 @@
+from research.prompts import render_prompt
+
 class ResearchRefiner:
+    SCHEMA = {
+        "type": "object",
+        "properties": {
+            "next_direction": {
+                "type": "string",
+                "minLength": 1,
+                "description": "clear statement of the next research direction"
+            },
+            "reasoning": {
+                "type": "string",
+                "description": "brief explanation of why this direction is valuable"
+            },
+            "goal": {
+                "type": "string",
+                "minLength": 1,
+                "description": "specific information to look for"
+            }
+        },
+        "required": ["next_direction", "goal"]
+    }
+    
+    BEAM_SCHEMA = {
+        "type": "object",
+        "properties": {
+            "directions": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": SCHEMA["properties"],
+                    "required": SCHEMA["required"]
+                },
+                "minItems": 1,
+                "description": "the most promising next directions, best first, each an object with "
+                               "next_direction, reasoning and goal"
+            }
+        },
+        "required": ["directions"]
+    }
+    
     def __init__(self, model_interface):
         self.model = model_interface
     
     async def refine_research(self, original_query, current_context, learnings, directions):
         """Determine the next research direction based on findings."""
-        prompt = f"""
-        Based on the original research query, current context, and recent findings,
-        determine the most promising direction to continue this research.
-        
-        ORIGINAL QUERY:
-        {original_query}
-        
-        CURRENT RESEARCH CONTEXT:
-        {current_context}
-        
-        KEY LEARNINGS SO FAR:
-        {", ".join(learnings)}
+        prompt = render_prompt(
+            "research_refinement",
+            original_query=original_query,
+            context=current_context,
+            learnings=", ".join(learnings),
+            directions=", ".join(directions)
+        )
         
-        POSSIBLE NEXT DIRECTIONS:
-        {", ".join(directions)}
+        response = await self.model.generate_structured(prompt, self.SCHEMA, stage="research_refinement")
         
-        OUTPUT FORMAT:
-        NEXT DIRECTION: [Clear statement of the next research direction]
-        REASONING: [Brief explanation of why this direction is valuable]
-        SPECIFIC GOAL: [Specific information to look for]
-        """
-        
-        response = await self.model.generate(prompt)
-        
-        # Parse the response to extract the next direction
-        next_direction = ""
-        reasoning = ""
-        goal = ""
+        return {
+            "direction": response["next_direction"],
+            "reasoning": response["reasoning"],
+            "goal": response["goal"]
+        }
+    
+    async def propose_directions(self, original_query, current_context, learnings, directions, k=3):
+        """Propose the top-k distinct next research directions, best first, for beam search."""
+        prompt = render_prompt(
+            "research_beam_refinement",
+            count=k,
+            original_query=original_query,
+            context=current_context,
+            learnings=", ".join(learnings),
+            directions=", ".join(directions)
+        )
         
-        for line in response.split("\n"):
-            if line.startswith("NEXT DIRECTION:"):
-                next_direction = line.replace("NEXT DIRECTION:", "").strip()
-            elif line.startswith("REASONING:"):
-                reasoning = line.replace("REASONING:", "").strip()
-            elif line.startswith("SPECIFIC GOAL:"):
-                goal = line.replace("SPECIFIC GOAL:", "").strip()
+        response = await self.model.generate_structured(prompt, self.BEAM_SCHEMA, stage="research_refinement")
         
-        return {
-            "direction": next_direction,
-            "reasoning": reasoning,
-            "goal": goal
-        }
\ No newline at end of file
+        return [
+            {
+                "direction": item["next_direction"],
+                "reasoning": item.get("reasoning", ""),
+                "goal": item["goal"]
+            }
+            for item in response["directions"][:k]
+        ]
\ No newline at end of file
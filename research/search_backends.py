@@ -0,0 +1,484 @@
+import asyncio
+import contextlib
+import re
+import time
+from collections import deque
+import urllib.parse
+import xml.etree.ElementTree as ET
+from research.arxiv_index import ArxivIndex
+from research.search_filters import SearchFilters
+from models.cassette import open_cassette
+
+
+class SearchBackend:
+    """
+    Base class for paper search backends.
+
+    A backend has a `name`, a per-call `timeout` in seconds and an async
+    `search(query, num_results)` returning paper dicts in the arXiv record shape
+    (title, authors, summary, published, updated, url, id, arxiv_id, comment,
+    journal_ref, categories, doi). Backends that can page through results
+    override `stream`, an async generator yielding papers as they arrive.
+    """
+
+    name = "backend"
+
+    def __init__(self, timeout=10.0):
+        self.timeout = timeout
+
+    async def search(self, query, num_results):
+        raise NotImplementedError
+
+    async def stream(self, query, max_results):
+        """Yield papers one by one; the default runs a single `search` call."""
+        for paper in await self.search(query, max_results):
+            yield paper
+
+
+class RateLimiter:
+    """Spaces request start times at least `min_interval` seconds apart, across all callers."""
+
+    def __init__(self, min_interval):
+        self.min_interval = min_interval
+        self._lock = None
+        self._loop = None
+        self._last_request = 0.0
+
+    async def wait(self):
+        # The Streamlit app starts a fresh event loop per run, so the lock is per loop
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._lock, self._loop = asyncio.Lock(), loop
+
+        async with self._lock:
+            delay = self._last_request + self.min_interval - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._last_request = time.monotonic()
+
+
+class ArxivAPIBackend(SearchBackend):
+    """Search backend for the public arXiv Atom API."""
+
+    name = "arxiv"
+
+    # arXiv asks clients to leave ~3 seconds between API calls; shared by every instance in the process
+    rate_limiter = None
+
+    def __init__(self, config, timeout=15.0):
+        super().__init__(timeout)
+        self.config = config
+        self.base_url = "http://export.arxiv.org/api/query"
+        self.page_size = config.get("arxiv_page_size", 50)
+        self.filters = SearchFilters.from_config(config)
+        self.prefetch_pages = config.get("arxiv_prefetch_pages", 2)
+
+        if ArxivAPIBackend.rate_limiter is None:
+            ArxivAPIBackend.rate_limiter = RateLimiter(config.get("arxiv_min_interval", 3.0))
+
+        # Records API responses, or replays them without touching the network
+        self.cassette = open_cassette(config)
+
+        # Define XML namespaces used in arXiv responses
+        self.namespaces = {
+            'atom': 'http://www.w3.org/2005/Atom',
+            'opensearch': 'http://a9.com/-/spec/opensearch/1.1/',
+            'arxiv': 'http://arxiv.org/schemas/atom'
+        }
+
+    async def search(self, query, num_results):
+        """Search arXiv for papers matching the query."""
+        return [paper async for paper in self.stream(query, num_results)]
+
+    async def stream(self, query, max_results):
+        """
+        Page through arXiv results with `start`/`max_results`, yielding papers as each
+        page is parsed. Up to `arxiv_prefetch_pages` pages are requested ahead (still
+        spaced by the rate limiter) so later pages download while earlier ones are
+        consumed. Closing the generator early cancels the outstanding requests.
+        """
+        starts = deque(range(0, max_results, self.page_size))
+        pending = deque()  # (start, count, task) in page order
+
+        async with self._session() as session:
+            def schedule():
+                while starts and len(pending) < max(1, self.prefetch_pages):
+                    start = starts.popleft()
+                    count = min(self.page_size, max_results - start)
+                    task = asyncio.create_task(self._fetch_page(session, query, start, count))
+                    pending.append((start, count, task))
+
+            try:
+                schedule()
+                while pending:
+                    start, count, task = pending.popleft()
+                    results, total = await task
+                    for paper in results:
+                        yield paper
+
+                    # Stop paging once arXiv has no more results for the query
+                    if len(results) < count:
+                        break
+                    if total is not None:
+                        while starts and starts[-1] >= total:
+                            starts.pop()
+                    schedule()
+            finally:
+                for _, _, task in pending:
+                    task.cancel()
+
+    def _session(self):
+        """HTTP session for a stream; none is needed when replaying a cassette."""
+        if self.cassette and self.cassette.replaying:
+            return contextlib.nullcontext()
+
+        import aiohttp  # Imported on first use; the local index needs no HTTP client
+        return aiohttp.ClientSession()
+
+    async def _fetch_page(self, session, query, start, count):
+        """Fetch and parse one page of results; returns (papers, total result count or None)."""
+        # Format the arXiv API URL
+        params = {
+            'search_query': self.filters.arxiv_query(query),  # Terms plus category/date/field filters
+            'start': start,
+            'max_results': count
+        }
+        params.update(self.filters.arxiv_sort_params())
+
+        url = f"{self.base_url}?{urllib.parse.urlencode(params)}"
+        print(f"    Requesting: {url}")
+
+        if self.cassette:
+            xml_data = await self.cassette.call("arxiv", {"url": url}, lambda: self._get(session, url))
+        else:
+            xml_data = await self._get(session, url)
+
+        results = self._parse_arxiv_response(xml_data)
+        print(f"    Parsed {len(results)} results from arXiv response")
+        return results, self._total_results(xml_data)
+
+    async def _get(self, session, url):
+        """GET one API page, respecting the rate limit; returns the response XML."""
+        await self.rate_limiter.wait()
+
+        async with session.get(url) as response:
+            if response.status == 200:
+                return await response.text()
+            else:
+                error = await response.text()
+                raise Exception(f"arXiv search failed ({response.status}): {error}")
+
+    def _total_results(self, xml_data):
+        """Read opensearch:totalResults from a response, or None if absent."""
+        el = ET.fromstring(xml_data).find('opensearch:totalResults', self.namespaces)
+        try:
+            return int(el.text)
+        except (AttributeError, TypeError, ValueError):
+            return None
+
+    def _parse_arxiv_response(self, xml_data):
+        """Parse the arXiv API response XML into a list of paper data."""
+        root = ET.fromstring(xml_data)
+        results = []
+
+        # Extract papers from the response
+        for entry in root.findall('.//atom:entry', self.namespaces):
+            paper = {
+                'title': self._get_element_text(entry, './atom:title'),
+                'authors': self._get_authors(entry),
+                'summary': self._get_element_text(entry, './atom:summary'),
+                'published': self._get_element_text(entry, './atom:published'),
+                'updated': self._get_element_text(entry, './atom:updated'),
+                'url': self._get_element_attr(entry, './atom:link[@title="pdf"]', 'href'),
+                'id': self._get_element_text(entry, './atom:id'),
+                'arxiv_id': self._extract_arxiv_id(
+                    self._get_element_text(entry, './atom:id')
+                ),
+                'comment': self._get_element_text(entry, './arxiv:comment'),
+                'journal_ref': self._get_element_text(entry, './arxiv:journal_ref'),
+                'categories': self._get_categories(entry),
+                'doi': self._get_element_text(entry, './arxiv:doi')
+            }
+            results.append(paper)
+
+        return results
+
+    def _get_element_text(self, element, xpath):
+        """Get the text content of an XML element."""
+        el = element.find(xpath, self.namespaces)
+        return el.text.strip() if el is not None and el.text else ""
+
+    def _get_element_attr(self, element, xpath, attr):
+        """Get an attribute from an XML element."""
+        el = element.find(xpath, self.namespaces)
+        return el.get(attr, "") if el is not None else ""
+
+    def _get_authors(self, entry):
+        """Extract all authors from an entry."""
+        authors = []
+        for author in entry.findall('./atom:author', self.namespaces):
+            name = author.find('./atom:name', self.namespaces)
+            if name is not None and name.text:
+                authors.append(name.text.strip())
+        return authors
+
+    def _get_categories(self, entry):
+        """Extract all categories from an entry."""
+        categories = []
+        for category in entry.findall('./atom:category', self.namespaces):
+            term = category.get('term')
+            if term:
+                categories.append(term)
+        return categories
+
+    def _extract_arxiv_id(self, id_url):
+        """Extract the arXiv ID from the full URL."""
+        if id_url:
+            # URLs are typically like http://arxiv.org/abs/2107.12345
+            parts = id_url.split('/')
+            return parts[-1] if parts else id_url
+        return ""
+
+
+class LocalIndexBackend(SearchBackend):
+    """Search backend for the SQLite FTS5 index built with ingest_arxiv.py."""
+
+    name = "local"
+
+    def __init__(self, index_path, timeout=2.0, filters=None):
+        super().__init__(timeout)
+        self.index = ArxivIndex(index_path)
+        self.filters = filters or SearchFilters()
+
+    async def search(self, query, num_results):
+        # Run the query off the event loop so a slow MATCH cannot stall other backends
+        results = await asyncio.to_thread(self.index.search, query, num_results, self.filters)
+        print(f"    Found {len(results)} results in local arXiv index")
+        return results
+
+
+class HTTPJSONBackend(SearchBackend):
+    """
+    Search backend for a generic HTTP endpoint that answers a GET request with JSON.
+
+    The endpoint is described by a config dict:
+        name:          backend name used in logs and `federated_backends`
+        url:           endpoint URL
+        query_param:   name of the query parameter (default "q")
+        limit_param:   name of the result-count parameter (default "limit")
+        params:        extra static query parameters
+        results_key:   dotted path to the result list in the response (default: the response itself)
+        field_map:     maps paper fields to response fields, e.g. {"summary": "abstract"}
+        timeout:       per-call timeout in seconds
+    """
+
+    def __init__(self, endpoint, filters=None):
+        super().__init__(endpoint.get("timeout", 10.0))
+        # Generic endpoints cannot take the filters in their query, so results are filtered on arrival
+        self.filters = filters or SearchFilters()
+        self.name = endpoint.get("name", "http")
+        self.url = endpoint["url"]
+        self.query_param = endpoint.get("query_param", "q")
+        self.limit_param = endpoint.get("limit_param", "limit")
+        self.params = endpoint.get("params", {})
+        self.results_key = endpoint.get("results_key", "")
+        self.field_map = endpoint.get("field_map", {})
+
+    async def search(self, query, num_results):
+        params = dict(self.params)
+        params[self.query_param] = query
+        params[self.limit_param] = num_results
+
+        import aiohttp
+
+        async with aiohttp.ClientSession() as session:
+            async with session.get(self.url, params=params) as response:
+                if response.status != 200:
+                    error = await response.text()
+                    raise Exception(f"{self.name} search failed ({response.status}): {error}")
+                data = await response.json(content_type=None)
+
+        for key in filter(None, self.results_key.split(".")):
+            data = data.get(key, []) if isinstance(data, dict) else []
+
+        papers = [self._to_paper(item) for item in data if isinstance(item, dict)]
+        return [paper for paper in papers if self.filters.matches(paper)][:num_results]
+
+    def _to_paper(self, item):
+        """Map one JSON result onto the arXiv paper record shape."""
+        def field(name, default=""):
+            value = item.get(self.field_map.get(name, name), default)
+            return value if value is not None else default
+
+        authors = field("authors", [])
+        if isinstance(authors, str):
+            authors = [a.strip() for a in authors.split(",") if a.strip()]
+        authors = [a.get("name", "") if isinstance(a, dict) else str(a) for a in authors]
+
+        categories = field("categories", [])
+        if isinstance(categories, str):
+            categories = categories.split()
+
+        arxiv_id = field("arxiv_id")
+        return {
+            'title': field("title"),
+            'authors': authors,
+            'summary': field("summary"),
+            'published': field("published"),
+            'updated': field("updated"),
+            'url': field("url") or (f"http://arxiv.org/pdf/{arxiv_id}" if arxiv_id else ""),
+            'id': field("id") or (f"http://arxiv.org/abs/{arxiv_id}" if arxiv_id else ""),
+            'arxiv_id': arxiv_id,
+            'comment': field("comment"),
+            'journal_ref': field("journal_ref"),
+            'categories': list(categories),
+            'doi': field("doi")
+        }
+
+
+class FederatedSearcher(SearchBackend):
+    """
+    Fan a query out to several backends concurrently and merge the results.
+
+    Each backend runs under its own timeout; backends that miss it or fail are
+    dropped for that query instead of stalling it. The ranked lists are merged
+    with reciprocal-rank fusion and deduplicated by arXiv ID (ignoring the
+    version suffix), DOI or normalised title: copies sharing any of these are one paper.
+    """
+
+    name = "federated"
+
+    def __init__(self, backends, rrf_k=60):
+        super().__init__(max((b.timeout for b in backends), default=0))
+        self.backends = backends
+        self.rrf_k = rrf_k
+
+    async def search(self, query, num_results):
+        ranked_lists = await asyncio.gather(
+            *(self._search_backend(backend, query, num_results) for backend in self.backends)
+        )
+        return self._fuse(ranked_lists)[:num_results]
+
+    async def _search_backend(self, backend, query, num_results):
+        """Query one backend, returning an empty list if it times out or fails."""
+        start = time.monotonic()
+        try:
+            results = await asyncio.wait_for(backend.search(query, num_results), backend.timeout)
+        except asyncio.TimeoutError:
+            print(f"    Backend '{backend.name}' missed its {backend.timeout}s deadline, dropped")
+            return []
+        except Exception as e:
+            print(f"    Backend '{backend.name}' failed: {e}")
+            return []
+
+        print(f"    Backend '{backend.name}' returned {len(results)} results in {time.monotonic() - start:.2f}s")
+        return results
+
+    def _fuse(self, ranked_lists):
+        """
+        Merge ranked lists with reciprocal-rank fusion. Copies of a paper are joined through any
+        identifier they share (arXiv ID, DOI or title), so a paper listed by its arXiv ID in one
+        backend and by its DOI in another is one entry. The first copy is kept, with fields it
+        lacks filled in from the others.
+        """
+        parent = []  # entry -> entry it was merged into (union-find)
+        aliases = {}  # identifier -> entry
+        papers = []
+        list_scores = []  # entry -> {list index: best RRF score in that list}
+
+        def find(entry):
+            while parent[entry] != entry:
+                parent[entry] = parent[parent[entry]]
+                entry = parent[entry]
+            return entry
+
+        for list_index, results in enumerate(ranked_lists):
+            for rank, paper in enumerate(results):
+                keys = self.dedup_keys(paper)
+                # Two different arXiv IDs or DOIs are two papers, even under the same title
+                entries = {find(aliases[k]) for k in keys if k in aliases}
+                entries = {e for e in entries if not self._conflicts(papers[e], paper)}
+
+                if entries:
+                    entry = min(entries)
+                    for other in entries - {entry}:
+                        parent[other] = entry
+                        for index, score in list_scores[other].items():
+                            list_scores[entry][index] = max(list_scores[entry].get(index, 0.0), score)
+                        self._fill_missing(papers[entry], papers[other])
+                    self._fill_missing(papers[entry], paper)
+                else:
+                    entry = len(parent)
+                    parent.append(entry)
+                    papers.append(dict(paper))
+                    list_scores.append({})
+
+                for key in keys:
+                    aliases.setdefault(key, entry)
+
+                # A paper listed twice by one backend counts once, at its best rank
+                score = 1.0 / (self.rrf_k + rank + 1)
+                list_scores[entry][list_index] = max(list_scores[entry].get(list_index, 0.0), score)
+
+        roots = [entry for entry in range(len(parent)) if find(entry) == entry]
+        roots.sort(key=lambda entry: sum(list_scores[entry].values()), reverse=True)
+        return [papers[entry] for entry in roots]
+
+    @classmethod
+    def _conflicts(cls, paper, other):
+        ids = dict(key.split(":", 1) for key in cls.dedup_keys(paper))
+        other_ids = dict(key.split(":", 1) for key in cls.dedup_keys(other))
+        return any(kind in ids and kind in other_ids and ids[kind] != other_ids[kind] for kind in ("arxiv", "doi"))
+
+    @staticmethod
+    def _fill_missing(paper, other):
+        for field, value in other.items():
+            if value and not paper.get(field):
+                paper[field] = value
+
+    @staticmethod
+    def dedup_keys(paper):
+        """Identifiers of a paper across backends: arXiv ID without version, DOI and normalised title."""
+        keys = []
+        arxiv_id = (paper.get("arxiv_id") or "").strip()
+        if arxiv_id:
+            keys.append("arxiv:" + re.sub(r"v\d+$", "", arxiv_id))
+
+        doi = (paper.get("doi") or "").strip().lower()
+        if doi:
+            keys.append("doi:" + doi)
+
+        title = " ".join(re.findall(r"\w+", (paper.get("title") or "").lower()))
+        if title:
+            keys.append("title:" + title)
+
+        return keys
+
+
+def build_search_backend(config):
+    """Build the search backend selected by `search_backend` in the config."""
+    timeouts = config.get("backend_timeouts", {})
+    endpoints = {e["name"]: e for e in config.get("http_search_endpoints", [])}
+    filters = SearchFilters.from_config(config)
+
+    def build(name):
+        if name == "arxiv":
+            return ArxivAPIBackend(config, timeouts.get("arxiv", 15.0))
+        if name == "local":
+            return LocalIndexBackend(
+                config.get("arxiv_index_path", "data/arxiv_index.db"),
+                timeouts.get("local", 2.0),
+                filters
+            )
+        if name in endpoints:
+            endpoint = dict(endpoints[name])
+            endpoint.setdefault("timeout", timeouts.get(name, 10.0))
+            return HTTPJSONBackend(endpoint, filters)
+        raise ValueError(f"Unknown search backend: {name}")
+
+    selected = config.get("search_backend", "arxiv")
+    if selected == "federated":
+        backends = [build(name) for name in config.get("federated_backends", ["arxiv"])]
+        return FederatedSearcher(backends, config.get("rrf_k", 60))
+
+    return build(selected)
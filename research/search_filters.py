@@ -0,0 +1,131 @@
+import re
+from datetime import date
+
+# Searchable record fields and their arXiv API query prefixes
+FIELD_PREFIXES = {"all": "all", "title": "ti", "abstract": "abs", "author": "au"}
+
+# Sort orders and their arXiv API `sortBy` values
+SORT_ORDERS = {"relevance": "relevance", "submitted": "submittedDate", "updated": "lastUpdatedDate"}
+
+# Guidance given to the query generator for each targeted field
+FIELD_GUIDANCE = {
+    "title": "Queries are matched against paper titles only, so use 2-5 words likely to appear in a title.",
+    "abstract": "Queries are matched against abstracts only.",
+    "author": "Queries are matched against author names only, so each query should be an author name.",
+}
+
+
+class SearchFilters:
+    """
+    Search options pushed down into the backend query instead of applied after download.
+
+    `categories` are arXiv categories ("cs.LG") or whole archives ("cs"),
+    `date_from`/`date_to` bound the submission date (YYYY-MM-DD, inclusive),
+    `field` targets all fields, the title, the abstract or the authors, and
+    `sort` orders results by relevance, submission date or last update.
+    """
+
+    def __init__(self, categories=None, date_from=None, date_to=None, field="all", sort="relevance"):
+        if field not in FIELD_PREFIXES:
+            raise ValueError(f"Unknown search field: {field} (expected one of {', '.join(FIELD_PREFIXES)})")
+        if sort not in SORT_ORDERS:
+            raise ValueError(f"Unknown sort order: {sort} (expected one of {', '.join(SORT_ORDERS)})")
+
+        self.categories = [c.strip() for c in categories or [] if c.strip()]
+        self.date_from = date.fromisoformat(date_from).isoformat() if date_from else None
+        self.date_to = date.fromisoformat(date_to).isoformat() if date_to else None
+        self.field = field
+        self.sort = sort
+
+    @classmethod
+    def from_config(cls, config):
+        categories = config.get("search_categories") or []
+        if isinstance(categories, str):
+            categories = categories.split(",")
+        return cls(
+            categories=categories,
+            date_from=config.get("search_date_from"),
+            date_to=config.get("search_date_to"),
+            field=config.get("search_field", "all"),
+            sort=config.get("search_sort", "relevance")
+        )
+
+    @property
+    def restricts_results(self):
+        return bool(self.categories or self.date_from or self.date_to or self.field != "all")
+
+    def arxiv_query(self, terms):
+        """Compile query terms and the filters into an arXiv API `search_query`."""
+        if not self.restricts_results:
+            return f"all:{terms}"
+
+        clauses = [self._field_clause(terms)]
+        if self.categories:
+            # A name without a dot is either a whole archive ("cs") or a category of its own ("quant-ph")
+            terms = [t for c in self.categories for t in ((f"cat:{c}",) if "." in c else (f"cat:{c}", f"cat:{c}.*"))]
+            clauses.append(f"({' OR '.join(terms)})" if len(terms) > 1 else terms[0])
+        if self.date_from or self.date_to:
+            # Open bounds are fixed dates, not today's, so the query (and its cassette key) is the same every day
+            start = (self.date_from or "1991-01-01").replace("-", "") + "0000"
+            end = (self.date_to or "2099-12-31").replace("-", "") + "2359"
+            clauses.append(f"submittedDate:[{start} TO {end}]")
+
+        return " AND ".join(clauses)
+
+    def _field_clause(self, terms):
+        """Prefix every term or quoted phrase with the field; bare adjacent terms are ANDed."""
+        prefix = FIELD_PREFIXES[self.field]
+        parts = []
+        for token in re.findall(r'"[^"]*"|\(|\)|[^\s()"]+', terms):
+            if token in ("AND", "OR", "ANDNOT", "NOT", ")"):
+                parts.append("ANDNOT" if token == "NOT" else token)
+                continue
+            if parts and parts[-1] not in ("AND", "OR", "ANDNOT", "("):
+                parts.append("AND")
+            parts.append(token if token == "(" else f"{prefix}:{token}")
+
+        clause = " ".join(parts).replace("( ", "(").replace(" )", ")")
+        return f"({clause})" if len(parts) > 1 else clause
+
+    def searched_text(self, paper):
+        """The text of a record that the backend matched the query terms against, for local scoring."""
+        title, summary = paper.get("title", ""), paper.get("summary", "")
+        authors = " ".join(paper.get("authors") or [])
+        fields = {"title": title, "abstract": summary, "author": authors}
+        return fields.get(self.field, f"{title} {summary} {authors}")
+
+    def arxiv_sort_params(self):
+        if self.sort == "relevance":
+            return {}
+        return {"sortBy": SORT_ORDERS[self.sort], "sortOrder": "descending"}
+
+    def matches(self, paper):
+        """Check a downloaded record against the category and date filters (for backends without push-down)."""
+        if self.categories:
+            paper_categories = paper.get("categories") or []
+            if not any(pc == c or pc.startswith(c + ".") for c in self.categories for pc in paper_categories):
+                return False
+
+        published = (paper.get("published") or "")[:10]
+        if self.date_from and published and published < self.date_from:
+            return False
+        if self.date_to and published and published > self.date_to:
+            return False
+
+        return True
+
+    def describe(self):
+        """Plain-language summary of the active filters, for the query generation prompt."""
+        lines = []
+        if self.categories:
+            lines.append(f"Results are restricted to the arXiv categories: {', '.join(self.categories)}.")
+        if self.date_from or self.date_to:
+            lines.append(f"Results are restricted to papers submitted between "
+                         f"{self.date_from or 'the beginning'} and {self.date_to or 'today'}.")
+        if self.field in FIELD_GUIDANCE:
+            lines.append(FIELD_GUIDANCE[self.field])
+        if self.sort != "relevance":
+            lines.append(f"Results are sorted by {self.sort} date, newest first, not by relevance.")
+        if self.categories or self.date_from or self.date_to:
+            lines.append("Do not repeat these restrictions in the queries themselves.")
+        return "\n".join(lines)
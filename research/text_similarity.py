@@ -0,0 +1,69 @@
+import math
+import re
+from collections import Counter
+
+# Small English stop-word list; enough to keep function words from dominating overlap scores
+STOP_WORDS = frozenset("""
+a an and are as at be been but by can could do does for from has have how in into is it its
+may might more most not of on or our over such than that the their them then there these they
+this those through to under up use used using via was we were what when where which while who
+why will with within without would
+""".split())
+
+
+def tokenize(text):
+    """Lower-case word tokens with stop words removed and plural/-ing endings trimmed."""
+    tokens = []
+    for word in re.findall(r"[a-z0-9]+", (text or "").lower()):
+        if word in STOP_WORDS or len(word) < 2:
+            continue
+        if len(word) > 4 and word.endswith("ing"):
+            word = word[:-3]
+        elif len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        tokens.append(word)
+    return tokens
+
+
+def jaccard_similarity(tokens_a, tokens_b):
+    """Set overlap of two token lists, in [0, 1]."""
+    set_a, set_b = set(tokens_a), set(tokens_b)
+    if not set_a or not set_b:
+        return 0.0
+    return len(set_a & set_b) / len(set_a | set_b)
+
+
+def cosine_similarity(tokens_a, tokens_b):
+    """Cosine similarity of the term-frequency vectors of two token lists, in [0, 1]."""
+    counts_a, counts_b = Counter(tokens_a), Counter(tokens_b)
+    if not counts_a or not counts_b:
+        return 0.0
+    dot = sum(count * counts_b[token] for token, count in counts_a.items())
+    norm_a = math.sqrt(sum(c * c for c in counts_a.values()))
+    norm_b = math.sqrt(sum(c * c for c in counts_b.values()))
+    return dot / (norm_a * norm_b)
+
+
+def max_similarity(tokens, corpus):
+    """Highest cosine similarity between a token list and any token list in the corpus."""
+    return max((cosine_similarity(tokens, other) for other in corpus), default=0.0)
+
+
+def query_coverage(tokens, query_tokens, context_tokens=()):
+    """
+    Share of the query's distinct terms that a text contains, weighted two to one against
+    the share of the context's terms, in [0, 1]. It does not fall as the text gets
+    longer, so it can rank abstracts and learnings of any length.
+    """
+    terms = set(tokens)
+    query = set(query_tokens)
+    context = set(context_tokens) - query
+    if not terms or not (query or context):
+        return 0.0
+    query_share = len(terms & query) / len(query) if query else 0.0
+    context_share = len(terms & context) / len(context) if context else 0.0
+    if not context:
+        return query_share
+    if not query:
+        return context_share
+    return (2 * query_share + context_share) / 3
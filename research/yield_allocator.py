@@ -0,0 +1,90 @@
+from research.search_filters import SearchFilters
+from research.text_similarity import tokenize, query_coverage
+
+
+class YieldAllocator:
+    """
+    Splits an iteration's paper budget across its queries by expected yield,
+    using only cheap local signals (no LLM calls).
+
+    Each search hit is scored by the share of the query's terms (and, at lower
+    weight, the research context's) that its title, abstract and the searched
+    field cover. Hits whose searched field (the title and abstract, or the
+    authors with `search_field: author`) shares no term with the query, or that
+    were read in earlier iterations, are not candidates, and a paper returned by several queries counts only for the query
+    it matches best. A query's expected yield is the summed score of its
+    candidates. The budget of `breadth` papers per query is divided in proportion
+    to those yields, and whatever rounding or a short query leaves over goes to the
+    best candidates not yet taken, so the whole budget is spent while candidates
+    remain. Queries without candidates are dropped, so they cost no fetches and no
+    extraction call.
+    """
+
+    def __init__(self, config):
+        # Hits considered per query, as a multiple of breadth
+        self.pool_factor = config.get("yield_pool_factor", 2)
+        # Hits are matched against the record field the backend searched
+        self.filters = SearchFilters.from_config(config)
+
+    def score(self, searched, context, known_sources):
+        """
+        Score the hits of each query.
+
+        `searched` is [(query, hits)] in query order. Returns [(query, [(score, paper)])]
+        with each query's candidate hits, best first.
+        """
+        context_tokens = tokenize(context)
+        best_query = {}  # paper URL -> (score, query index) of the query it matches best
+        scored = []
+        for index, (query, hits) in enumerate(searched):
+            query_tokens = tokenize(query)
+            entries = []
+            for paper in hits:
+                url = paper.get("url", "")
+                if url in known_sources:
+                    continue
+                field_tokens = tokenize(self.filters.searched_text(paper))
+                if not set(field_tokens) & set(query_tokens):
+                    continue
+                tokens = field_tokens + tokenize(f"{paper.get('title', '')} {paper.get('summary', '')}")
+                score = query_coverage(tokens, query_tokens, context_tokens)
+                entries.append((score, paper))
+                if url not in best_query or score > best_query[url][0]:
+                    best_query[url] = (score, index)
+            scored.append((query, entries))
+
+        return [
+            (query, sorted((e for e in entries if best_query[e[1].get("url", "")][1] == index),
+                           key=lambda e: e[0], reverse=True))
+            for index, (query, entries) in enumerate(scored)
+        ]
+
+    def allocate(self, scored, budget, max_per_query):
+        """
+        Divide `budget` papers across queries in proportion to their expected yield.
+
+        Returns [(query, papers)] in query order; an empty list means the query is dropped.
+        """
+        candidates = [(query, entries[:max_per_query]) for query, entries in scored]
+        yields = [self.expected_yield(entries) for _, entries in candidates]
+        total = sum(yields)
+        quotas = [min(int(budget * y / total), len(entries)) if total else 0
+                  for y, (_, entries) in zip(yields, candidates)]
+
+        # Hand out what rounding and short queries left over to the best remaining candidates
+        remaining = budget - sum(quotas)
+        while remaining > 0:
+            open_queries = [i for i, (_, entries) in enumerate(candidates) if quotas[i] < len(entries)]
+            if not open_queries:
+                break
+            best = max(open_queries, key=lambda i: candidates[i][1][quotas[i]][0])
+            quotas[best] += 1
+            remaining -= 1
+
+        return [(query, [paper for _, paper in entries[:quota]])
+                for (query, entries), quota in zip(candidates, quotas)]
+
+    @staticmethod
+    def expected_yield(entries):
+        """Summed score of a query's candidate hits."""
+        return sum(score for score, _ in entries)
@@ -1,9 +1,13 @@
 import streamlit as st
 import asyncio
+import html
 import os
+import uuid
+from collections import deque
 from pathlib import Path
 import json
 import time
+import datetime
 from research.coordinator import ResearchCoordinator
 from research.query_generator import QueryGenerator
 from research.web_searcher import WebSearcher
@@ -12,7 +16,6 @@ from research.research_refiner import ResearchRefiner
 from research.report_generator import ReportGenerator
 from models.model_interface import ModelInterface
 from config import DEFAULT_CONFIG
-from openai import OpenAI
 
 # Page configuration
 st.set_page_config(
@@ -90,13 +93,75 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Entries kept in the research log; older ones are dropped as new ones arrive
+PROGRESS_LOG_SIZE = 200
+
+# Query findings shown per page inside an iteration's results
+FINDINGS_PER_PAGE = 5
+
+
+# Results are rendered as one pre-built HTML block per iteration header and findings page, memoised on
+# the run ID, so reruns after a large run (e.g. moving a slider) cost a few widget calls instead of
+# thousands. Arguments starting with an underscore are not hashed by st.cache_data; the run ID and
+# position identify the content, which does not change once the run has finished.
+@st.cache_data(max_entries=256, show_spinner=False)
+def render_iteration_header(run_id, index, _iteration):
+    parts = []
+    if _iteration.get("direction"):
+        parts.append(f"<p><strong>Direction:</strong> {html.escape(_iteration['direction'])}</p>")
+    parts.append("<p><strong>Queries explored in this iteration:</strong></p>")
+    parts.append("<ul>" + "".join(f"<li>{html.escape(q)}</li>" for q in _iteration["queries"]) + "</ul>")
+    return "".join(parts)
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def render_findings_page(run_id, index, page, _iteration, _paper_details):
+    start = page * FINDINGS_PER_PAGE
+    return "".join(
+        render_finding(finding, _paper_details.get(finding["query"], []))
+        for finding in _iteration["findings"][start:start + FINDINGS_PER_PAGE]
+    )
+
+
+def render_finding(finding, papers):
+    parts = [f"<div class='paper-card'><p class='query'>Query: {html.escape(finding['query'])}</p>"]
+
+    # Show papers analyzed for this query
+    if papers:
+        parts.append("<p><strong>Papers analyzed:</strong></p><ul>")
+        for paper in papers:
+            authors = paper.get('authors', [])
+            author_text = f"{authors[0]} et al." if len(authors) > 2 else ", ".join(authors)
+            parts.append(f"<li><strong>{html.escape(paper['title'])}</strong> ({html.escape(paper['year'])})"
+                         f" - {html.escape(author_text)}</li>")
+        parts.append("</ul>")
+
+    if finding["learnings"]:
+        parts.append("<p><strong>Key Insights:</strong></p>")
+        parts.extend(f"<p class='learning'>• {html.escape(learning)}</p>" for learning in finding["learnings"])
+
+    if finding["sources"]:
+        parts.append("<p><strong>Sources:</strong></p>")
+        parts.extend(
+            f"<p class='source'><a href='{html.escape(source, quote=True)}' target='_blank'>{html.escape(source)}</a></p>"
+            for source in finding["sources"]
+        )
+
+    parts.append("</div>")
+    return "".join(parts)
+
+
 # Initialize session state variables
 if 'research_complete' not in st.session_state:
     st.session_state.research_complete = False
 if 'report' not in st.session_state:
     st.session_state.report = ""
 if 'progress' not in st.session_state:
-    st.session_state.progress = []
+    st.session_state.progress = deque(maxlen=PROGRESS_LOG_SIZE)
+if 'progress_count' not in st.session_state:
+    st.session_state.progress_count = 0
+if 'run_id' not in st.session_state:
+    st.session_state.run_id = ""
 if 'iterations' not in st.session_state:
     st.session_state.iterations = []
 if 'api_key' not in st.session_state:
@@ -107,6 +172,10 @@ if 'research_running' not in st.session_state:
     st.session_state.research_running = False
 if 'paper_details' not in st.session_state:
     st.session_state.paper_details = {}
+if 'run_summary' not in st.session_state:
+    st.session_state.run_summary = {}
+if 'report_partial' not in st.session_state:
+    st.session_state.report_partial = False
 
 # Header
 st.title("🔬 ArXiv Research Assistant")
@@ -151,6 +220,34 @@ with st.sidebar:
                     help="Number of research iterations")
     breadth = st.slider("Research Breadth", min_value=1, max_value=5, value=3,
                      help="Number of queries per iteration")
+    with st.expander("Search filters (optional)"):
+        search_categories = st.text_input("arXiv categories", value="",
+                                          help="Comma-separated categories or archives, e.g. cs.LG, cs.CL or cs")
+        limit_dates = st.checkbox("Limit submission dates", value=False)
+        search_date_from = st.date_input("Submitted from", disabled=not limit_dates,
+                                         value=datetime.date.today() - datetime.timedelta(days=365))
+        search_date_to = st.date_input("Submitted until", disabled=not limit_dates, value=datetime.date.today())
+        search_field = st.selectbox("Match terms in", ["all", "title", "abstract", "author"],
+                                    help="Record field the search terms are matched against")
+        search_sort = st.selectbox("Sort results by", ["relevance", "submitted", "updated"],
+                                   help="Date orders show the newest papers first")
+    with st.expander("Run budget (optional)"):
+        budget_tokens = st.number_input("Max tokens", min_value=0, value=0, step=10000,
+                                        help="0 means no limit")
+        budget_dollars = st.number_input("Max cost (USD)", min_value=0.0, value=0.0, step=0.05,
+                                         help="0 means no limit")
+        budget_minutes = st.number_input("Max time (minutes)", min_value=0.0, value=0.0, step=1.0,
+                                         help="0 means no limit")
+    beam_width = st.slider("Beam Width", min_value=1, max_value=4, value=DEFAULT_CONFIG["beam_width"],
+                           help="Number of refined directions explored in parallel in each iteration")
+    speculative = st.checkbox("Speculative planning", value=bool(DEFAULT_CONFIG["speculative_fraction"]),
+                              help="Plan the next iteration while the last queries of the current one finish")
+    adaptive_depth = st.checkbox("Adaptive depth", value=DEFAULT_CONFIG["adaptive_depth"],
+                                 help="Stop early or narrow the search when iterations stop finding new material")
+    incremental_report = st.checkbox("Incremental report", value=DEFAULT_CONFIG["incremental_report"],
+                                     help="Update a draft report after every iteration; the final step only polishes it")
+    reuse_extractions = st.checkbox("Reuse paper extractions", value=False,
+                                    help="Store what is extracted from each paper and reuse it in later runs")
     
     # Parameter explanations
     with st.expander("What do these parameters mean?"):
@@ -160,6 +257,18 @@ with st.sidebar:
         **Research Breadth**: The number of different queries to explore in each iteration, and how many papers to analyze per query.
         
         Higher values provide more comprehensive research but take longer to complete.
+        
+        **Beam Width**: With a value above 1, each iteration explores several refined directions in parallel, each with its own context. After every iteration the branches are scored by how much new material they found and only the best are continued.
+        
+        **Speculative planning**: Starts refining the research direction and generating the next iteration's queries once most of the current queries are done. If the remaining results turn out to change the picture, the plan is discarded and made again.
+        
+        **Run budget**: An optional ceiling on tokens, cost or time. As it runs down, the research narrows its breadth, skips refinement steps and finally stops early, always keeping enough to write the report.
+        
+        **Adaptive depth**: Measures how much new material each iteration adds compared to earlier ones, and stops early or reduces breadth when the gain becomes small.
+        
+        **Reuse paper extractions**: Findings are extracted from each paper once, independently of the current question, and saved in `data/extractions.db`. Later runs reuse them for papers already read and only keep those relevant to the new research context, so overlapping topics cost fewer model calls.
+        
+        **Incremental report**: Keeps a draft report that is updated after every iteration and shown while the research runs. If the run fails or is cut short, the draft is kept as a partial report.
         """)
     
     # About section
@@ -181,6 +290,9 @@ if not api_key:
 # Create a placeholder for the current step display
 current_step_placeholder = st.empty()
 
+# Placeholder for the running report draft in incremental mode
+draft_placeholder = st.empty()
+
 # Start research button
 start_button = st.button("Start Research", disabled=(not api_key or not query))
 
@@ -189,14 +301,32 @@ async def run_research(query, model_id, depth, breadth, model_provider):
     # Reset state
     st.session_state.research_complete = False
     st.session_state.report = ""
-    st.session_state.progress = []
+    st.session_state.progress = deque(maxlen=PROGRESS_LOG_SIZE)
+    st.session_state.progress_count = 0
     st.session_state.iterations = []
+    st.session_state.run_id = uuid.uuid4().hex
     st.session_state.research_running = True
     st.session_state.paper_details = {}
+    st.session_state.run_summary = {}
+    st.session_state.report_partial = False
+    coordinator = None
     
     # Update config with API key
     config = DEFAULT_CONFIG.copy()
     config["provider"] = model_provider
+    config["adaptive_depth"] = adaptive_depth
+    config["beam_width"] = beam_width
+    config["speculative_fraction"] = (DEFAULT_CONFIG["speculative_fraction"] or 0.6) if speculative else None
+    config["budget_max_tokens"] = budget_tokens or None
+    config["budget_max_cost"] = budget_dollars or None
+    config["budget_max_seconds"] = budget_minutes * 60 or None
+    config["incremental_report"] = incremental_report
+    config["search_categories"] = [c.strip() for c in search_categories.split(",") if c.strip()]
+    config["search_date_from"] = search_date_from.isoformat() if limit_dates else None
+    config["search_date_to"] = search_date_to.isoformat() if limit_dates else None
+    config["search_field"] = search_field
+    config["search_sort"] = search_sort
+    config["extraction_store_path"] = "data/extractions.db" if reuse_extractions else None
     
     if model_provider == "openai":
         config["openai_api_key"] = st.session_state.openai_api_key
@@ -208,6 +338,7 @@ async def run_research(query, model_id, depth, breadth, model_provider):
         timestamp = time.strftime('%H:%M:%S')
         full_message = f"{timestamp} - {message}"
         st.session_state.progress.append(full_message)
+        st.session_state.progress_count += 1
         st.session_state.current_step = message
         
         # Update the current step display with more detailed information
@@ -233,188 +364,155 @@ async def run_research(query, model_id, depth, breadth, model_provider):
             f"Creating a multi-stage research pipeline with {depth} iterations, each exploring {breadth} different aspects of the topic."
         )
         
-        query_generator = QueryGenerator(model)
+        query_generator = QueryGenerator(model, config)
         web_searcher = WebSearcher(config)
         content_processor = ContentProcessor(model, config)
         research_refiner = ResearchRefiner(model)
         report_generator = ReportGenerator(model)
         
-        # Create coordinator
-        coordinator = ResearchCoordinator(
-            query_generator,
-            web_searcher,
-            content_processor,
-            research_refiner,
-            report_generator
-        )
-        
-        # Override the conduct_research method to capture progress
-        async def conduct_research_with_updates(query, depth=depth, breadth=breadth):
-            original_query = query
-            current_context = f"Initial research query: {query}"
-            research_iterations = []
-            
-            for iteration in range(depth):
-                iteration_data = {
-                    "iteration": iteration + 1,
-                    "context": current_context,
-                    "queries": [],
-                    "findings": []
-                }
-                
+        # Translate coordinator progress events into the step-by-step log shown in the UI
+        def handle_event(event, data):
+            if event == "iteration_started":
                 add_progress(
-                    f"Starting research iteration {iteration+1}/{depth} on '{query}'", 
-                    f"Each iteration builds upon previous findings to explore the topic more deeply. We're now in iteration {iteration+1}."
+                    f"Starting research iteration {data['iteration']}/{data['depth']} on '{query}'", 
+                    f"Each iteration builds upon previous findings to explore the topic more deeply. We're now in iteration {data['iteration']}."
                 )
-                
-                # Generate search queries
+            elif event == "generating_queries":
                 add_progress(
                     f"Generating specialized search queries for '{query}'", 
-                    f"Creating {breadth} targeted academic search terms to find the most relevant papers on arXiv."
+                    f"Creating {data['breadth']} targeted academic search terms to find the most relevant papers on arXiv."
                 )
-                queries = await query_generator.generate_queries(current_context, breadth)
-                iteration_data["queries"] = queries
-                
-                # Process each query
-                for query_index, q in enumerate(queries):
+            elif event == "query_started":
+                add_progress(
+                    f"Searching arXiv for papers on: '{data['query']}'", 
+                    f"Query {data['index']}/{data['total']} - Searching academic database for relevant research papers."
+                )
+            elif event == "search_results":
+                q = data["query"]
+                search_results = data["results"]
+                if len(search_results) == 0:
                     add_progress(
-                        f"Searching arXiv for papers on: '{q}'", 
-                        f"Query {query_index+1}/{len(queries)} - Searching academic database for relevant research papers."
+                        f"No papers found for '{q}'", 
+                        "Moving to next query to find more relevant research."
                     )
-                    try:
-                        search_results = await web_searcher.search(q)
-                        
-                        if len(search_results) == 0:
-                            add_progress(
-                                f"No papers found for '{q}'", 
-                                "Moving to next query to find more relevant research."
-                            )
-                            continue
-                        
-                        papers_info = f"Found {len(search_results)} papers including: "
-                        papers_info += ", ".join([f"'{result.get('title', 'Untitled')}'" for result in search_results[:3]])
-                        if len(search_results) > 3:
-                            papers_info += f" and {len(search_results)-3} more"
-                        
-                        add_progress(
-                            f"Found {len(search_results)} relevant papers on '{q}'", 
-                            papers_info
-                        )
-                        
-                        # Store paper titles for later reference
-                        st.session_state.paper_details[q] = [
-                            {
-                                "title": result.get('title', 'Untitled'),
-                                "authors": result.get('authors', []),
-                                "year": result.get('published', '')[:4] if result.get('published') else 'Unknown'
-                            }
-                            for result in search_results[:breadth]
-                        ]
-                        
-                        # Fetch content for each result
-                        enriched_results = []
-                        for i, result in enumerate(search_results[:breadth]):
-                            try:
-                                paper_title = result.get('title', 'Untitled')
-                                paper_authors = ", ".join(result.get('authors', []))[:50]
-                                if paper_authors and len(result.get('authors', [])) > 2:
-                                    paper_authors += f" et al."
-                                
-                                add_progress(
-                                    f"Analyzing paper ({i+1}/{min(breadth, len(search_results))}): '{paper_title}'", 
-                                    f"Authors: {paper_authors} | Reading and extracting key insights from this academic paper."
-                                )
-                                content = await web_searcher.fetch_content(result)
-                                enriched_results.append(content)
-                            except Exception as e:
-                                add_progress(f"Error processing paper: {str(e)}")
-                        
-                        # Process the results
-                        add_progress(
-                            f"Synthesizing findings from {len(enriched_results)} papers on '{q}'", 
-                            f"Identifying key concepts, extracting insights, and connecting information across multiple academic sources."
-                        )
-                        processed = await content_processor.process_search_results(
-                            q, enriched_results, current_context
-                        )
-                        
-                        # Show a sample of what was found
-                        if processed["learnings"]:
-                            learning_sample = processed["learnings"][0]
-                            add_progress(
-                                f"Found key insight about '{q}'", 
-                                f"Example finding: {learning_sample}"
-                            )
-                        
-                        coordinator.all_learnings.extend(processed["learnings"])
-                        coordinator.all_sources.extend(processed["sources"])
-                        
-                        finding_data = {
-                            "query": q,
-                            "learnings": processed["learnings"],
-                            "directions": processed["directions"],
-                            "sources": processed["sources"]
-                        }
-                        
-                        iteration_data["findings"].append(finding_data)
-                        
-                    except Exception as e:
-                        add_progress(f"ERROR processing query: {str(e)}")
-                
-                research_iterations.append(iteration_data)
-                st.session_state.iterations.append(iteration_data)
+                    return
                 
-                # If this is the last iteration, break
-                if iteration == depth - 1:
-                    break
-                    
-                # Otherwise, refine research direction
-                all_directions = []
-                for finding in iteration_data["findings"]:
-                    all_directions.extend(finding["directions"])
+                papers_info = f"Found {len(search_results)} papers including: "
+                papers_info += ", ".join([f"'{result.get('title', 'Untitled')}'" for result in search_results[:3]])
+                if len(search_results) > 3:
+                    papers_info += f" and {len(search_results)-3} more"
                 
                 add_progress(
-                    f"Refining research focus for iteration {iteration+2}", 
-                    f"Based on {len(coordinator.all_learnings)} insights gathered so far, determining most promising directions to explore next."
+                    f"Found {len(search_results)} relevant papers on '{q}'", 
+                    papers_info
                 )
-                refinement = await research_refiner.refine_research(
-                    original_query, 
-                    current_context,
-                    coordinator.all_learnings[-10:] if len(coordinator.all_learnings) > 10 else coordinator.all_learnings,
-                    all_directions
+            elif event == "papers_allocated":
+                # Store the titles of the papers chosen for each query for later reference
+                for q, papers in data["allocation"]:
+                    st.session_state.paper_details[q] = [
+                        {
+                            "title": result.get('title', 'Untitled'),
+                            "authors": result.get('authors', []),
+                            "year": result.get('published', '')[:4] if result.get('published') else 'Unknown'
+                        }
+                        for result in papers
+                    ]
+                total_papers = sum(len(papers) for _, papers in data["allocation"])
+                add_progress(
+                    f"Selected {total_papers} papers across {len(data['allocation'])} queries", 
+                    "Papers are shared out by how relevant and new each query's results look."
                 )
+            elif event == "query_dropped":
+                add_progress(
+                    f"Dropping query '{data['query']}'", 
+                    "Its results were off-topic or already read, so no papers are analyzed for it."
+                )
+            elif event == "paper_started":
+                result = data["paper"]
+                paper_title = result.get('title', 'Untitled')
+                paper_authors = ", ".join(result.get('authors', []))[:50]
+                if paper_authors and len(result.get('authors', [])) > 2:
+                    paper_authors += f" et al."
                 
-                # Update context for next iteration
-                current_context = f"""
-                Original query: {original_query}
-                Current iteration: {iteration + 1}
-                Recent learnings: {', '.join(coordinator.all_learnings[-5:])}
-                Next direction: {refinement['direction']}
-                Goal: {refinement['goal']}
-                """
-                
+                add_progress(
+                    f"Analyzing paper ({data['index']}/{data['total']}): '{paper_title}'", 
+                    f"Authors: {paper_authors} | Reading and extracting key insights from this academic paper."
+                )
+            elif event == "paper_error":
+                add_progress(f"Error processing paper: {data['error']}")
+            elif event == "query_processing":
+                add_progress(
+                    f"Synthesizing findings from {data['paper_count']} papers on '{data['query']}'", 
+                    f"Identifying key concepts, extracting insights, and connecting information across multiple academic sources."
+                )
+            elif event == "query_processed":
+                # Show a sample of what was found
+                if data["processed"]["learnings"]:
+                    learning_sample = data["processed"]["learnings"][0]
+                    add_progress(
+                        f"Found key insight about '{data['query']}'", 
+                        f"Example finding: {learning_sample}"
+                    )
+            elif event == "query_error":
+                add_progress(f"ERROR processing query: {data['error']}")
+            elif event == "iteration_finished":
+                st.session_state.iterations.append(data["iteration_data"])
+            elif event == "novelty_measured":
+                add_progress(
+                    f"Iteration {data['iteration']} novelty gain: {data['gain']:.2f}", 
+                    f"{data['new_learnings']} new insights and {data['new_sources']} new papers. Decision: {data['decision']}."
+                )
+            elif event == "budget_action":
+                add_progress(
+                    f"Adjusting research to the run budget", 
+                    f"Budget running low: {data['action']}."
+                )
+            elif event == "speculation_started":
+                add_progress(
+                    f"Planning iteration {data['iteration']+1} ahead of time", 
+                    f"{data['finished_queries']} queries finished; refining the direction while the rest complete."
+                )
+            elif event == "speculation_resolved":
+                add_progress(
+                    f"Speculative plan {data['outcome']}", 
+                    f"The remaining queries changed {data['change']:.0%} of this iteration's insights."
+                )
+            elif event == "refining":
+                add_progress(
+                    f"Refining research focus for iteration {data['next_iteration']}", 
+                    f"Based on {data['learning_count']} insights gathered so far, determining most promising directions to explore next."
+                )
+            elif event == "refined":
                 add_progress(
                     f"New research direction identified", 
-                    f"Next focus area: {refinement['direction']}"
+                    f"Next focus area: {data['refinement']['direction']}"
+                )
+            elif event == "report_draft_updated":
+                add_progress(
+                    f"Report draft updated after iteration {data['iteration']}", 
+                    "The new insights were merged into the running report draft."
+                )
+                with draft_placeholder.container():
+                    with st.expander(f"Report draft (after iteration {data['iteration']})", expanded=False):
+                        st.markdown(data["report"])
+            elif event == "generating_report":
+                total_papers = sum(len(findings.get("sources", [])) for iteration in st.session_state.iterations for findings in iteration.get("findings", []))
+                add_progress(
+                    f"Generating comprehensive research report on '{query}'", 
+                    f"Synthesizing {data['learning_count']} key findings from approximately {total_papers} academic papers across {data['iterations']} research iterations."
                 )
-            
-            # Generate final report
-            total_papers = sum(len(findings.get("sources", [])) for iteration in research_iterations for findings in iteration.get("findings", []))
-            add_progress(
-                f"Generating comprehensive research report on '{query}'", 
-                f"Synthesizing {len(coordinator.all_learnings)} key findings from approximately {total_papers} academic papers across {depth} research iterations."
-            )
-            report = await report_generator.generate_report(
-                original_query,
-                research_iterations,
-                coordinator.all_learnings,
-                coordinator.all_sources
-            )
-            
-            return report
         
-        # Replace the method
-        coordinator.conduct_research = conduct_research_with_updates
+        # Create coordinator
+        coordinator = ResearchCoordinator(
+            query_generator,
+            web_searcher,
+            content_processor,
+            research_refiner,
+            report_generator,
+            config,
+            handle_event,
+            usage_tracker=model.usage
+        )
         
         # Start research
         add_progress(
@@ -422,25 +520,29 @@ async def run_research(query, model_id, depth, breadth, model_provider):
             f"Using {model_option} to explore academic literature with {depth} iterations and {breadth} queries per iteration."
         )
         report = await coordinator.conduct_research(query, depth, breadth)
+        draft_placeholder.empty()
         
         # Store the final report
         st.session_state.report = report
+        st.session_state.run_summary = coordinator.run_summary
         st.session_state.research_complete = True
         
         # Count total papers and findings
         total_papers = sum(len(findings.get("sources", [])) for iteration in st.session_state.iterations for findings in iteration.get("findings", []))
         total_learnings = len(coordinator.all_learnings)
         
+        iterations_run = coordinator.run_summary["iterations_run"]
+        
         add_progress(
             f"Research complete on '{query}'!", 
-            f"Analyzed {total_papers} papers across {depth} iterations, extracting {total_learnings} key insights."
+            f"Analyzed {total_papers} papers across {iterations_run} iterations, extracting {total_learnings} key insights."
         )
         
         # Update the current step display to show completion
         current_step_placeholder.markdown(
             f"""<div class="active-process" style="background-color: rgba(40, 167, 69, 0.1); border-left: 4px solid #28a745;">
                 <div>✅ Research complete on '{query}'!<br>
-                <small>Analyzed {total_papers} papers across {depth} iterations, extracting {total_learnings} key insights.</small></div>
+                <small>Analyzed {total_papers} papers across {iterations_run} iterations, extracting {total_learnings} key insights.</small></div>
                </div>""", 
             unsafe_allow_html=True
         )
@@ -449,6 +551,14 @@ async def run_research(query, model_id, depth, breadth, model_provider):
         error_message = f"ERROR: {str(e)}"
         add_progress(error_message)
         
+        # Keep whatever the run produced before the error as a partial report
+        if coordinator is not None and coordinator.all_learnings:
+            draft_placeholder.empty()
+            st.session_state.report = coordinator.partial_report()
+            st.session_state.report_partial = True
+            st.session_state.run_summary = coordinator.run_summary
+            st.session_state.research_complete = True
+        
         # Update the current step display to show error
         current_step_placeholder.markdown(
             f"""<div class="active-process" style="background-color: rgba(220, 53, 69, 0.1); border-left: 4px solid #dc3545;">
@@ -475,53 +585,87 @@ if start_button:
         # Run the async function without using st.spinner
         asyncio.run(run_research(query, model_id, depth, breadth, model_provider))
 
-# Display collapsible progress history
+# Display collapsible progress history as a single block
 if st.session_state.progress:
     with st.expander("Show detailed research log", expanded=False):
-        for step in st.session_state.progress:
-            st.markdown(f"<div class='progress-step'>{step}</div>", unsafe_allow_html=True)
+        dropped = st.session_state.progress_count - len(st.session_state.progress)
+        if dropped:
+            st.caption(f"Showing the latest {len(st.session_state.progress)} of "
+                       f"{st.session_state.progress_count} entries")
+        st.markdown(
+            "".join(f"<div class='progress-step'>{html.escape(step)}</div>" for step in st.session_state.progress),
+            unsafe_allow_html=True
+        )
 
-# Display iterations with paper details
+# Display iterations with paper details, one page of findings at a time
 if st.session_state.iterations:
+    run_id = st.session_state.run_id
     for i, iteration in enumerate(st.session_state.iterations):
-        with st.expander(f"Iteration {iteration['iteration']} Results", expanded=False):
-            st.markdown(f"**Queries explored in this iteration:**")
-            for q in iteration['queries']:
-                st.markdown(f"- {q}")
-            
+        label = f"Iteration {iteration['iteration']} Results"
+        if iteration.get("branch"):
+            label += f" (branch {iteration['branch']}, score {iteration.get('score', 0):.1f})"
+        with st.expander(label, expanded=False):
+            st.markdown(render_iteration_header(run_id, i, iteration), unsafe_allow_html=True)
             st.markdown("---")
-            
-            for finding in iteration["findings"]:
-                st.markdown(f"<div class='paper-card'>", unsafe_allow_html=True)
-                st.markdown(f"<p class='query'>Query: {finding['query']}</p>", unsafe_allow_html=True)
-                
-                # Show papers analyzed for this query
-                if finding['query'] in st.session_state.paper_details:
-                    papers = st.session_state.paper_details[finding['query']]
-                    if papers:
-                        st.markdown("**Papers analyzed:**")
-                        for paper in papers:
-                            authors = paper.get('authors', [])
-                            if len(authors) > 2:
-                                author_text = f"{authors[0]} et al."
-                            else:
-                                author_text = ", ".join(authors)
-                            
-                            st.markdown(f"- **{paper['title']}** ({paper['year']}) - {author_text}")
-                
-                if finding["learnings"]:
-                    st.markdown("**Key Insights:**")
-                    for learning in finding["learnings"]:
-                        st.markdown(f"<p class='learning'>• {learning}</p>", unsafe_allow_html=True)
-                
-                if finding["sources"]:
-                    st.markdown("**Sources:**")
-                    for source in finding["sources"]:
-                        st.markdown(f"<p class='source'>{source}</p>", unsafe_allow_html=True)
-                
-                st.markdown("</div>", unsafe_allow_html=True)
+
+            pages = max(1, -(-len(iteration["findings"]) // FINDINGS_PER_PAGE))
+            page = 0
+            if pages > 1:
+                page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1,
+                                       key=f"findings_page_{run_id}_{i}") - 1
+            st.markdown(render_findings_page(run_id, i, page, iteration, st.session_state.paper_details),
+                        unsafe_allow_html=True)
+
+# Display how the run went: usage and cost, adaptive-depth decisions and budget actions
+if st.session_state.run_summary:
+    summary = st.session_state.run_summary
+    with st.expander("Run summary", expanded=False):
+        st.markdown(f"**Iterations run:** {summary['iterations_run']}/{summary['planned_depth']}")
+        
+        if "usage" in summary:
+            usage = summary["usage"]
+            st.markdown(
+                f"**LLM usage:** {usage['calls']} calls, {usage['total_tokens']:,} tokens "
+                f"({usage['cached_tokens']:,} cached), ${usage['cost']:.4f}, {usage['elapsed_seconds']}s"
+            )
+            st.table([
+                {"Stage": stage, "Calls": g["calls"], "Tokens": g["total_tokens"], "Cost (USD)": round(g["cost"], 4)}
+                for stage, g in usage["by_stage"].items()
+            ])
+        
+        for level in summary.get("beam", []):
+            scores = ", ".join(f"{b}: {score:.1f}" for b, score in level["branch_scores"].items())
+            st.markdown(
+                f"- Beam after iteration {level['iteration']}: scores {scores}; "
+                f"continuing {', '.join(level['kept'])}, pruned {level['pruned']}"
+            )
+        
+        for plan in summary.get("speculation", []):
+            st.markdown(
+                f"- Speculative plan after iteration {plan['iteration']}: {plan['outcome']} "
+                f"(late results changed {plan['late_change']:.0%} of insights)"
+            )
+        
+        for level in summary.get("allocation", []):
+            shares = ", ".join(f"'{q}': {stats['papers']}" for q, stats in level["queries"].items())
+            st.markdown(f"- Papers per query in iteration {level['iteration']}: {shares}")
+        
+        for gain in summary["novelty"]:
+            st.markdown(
+                f"- Iteration {gain['iteration']}: novelty gain **{gain['gain']:.2f}** "
+                f"(insights {gain['learning_novelty']:.2f}, papers {gain['source_novelty']:.2f}) → {gain['decision']}"
+            )
+        
+        if "budget" in summary:
+            st.markdown(f"**Budget:** {summary['budget']['limits']}")
+            for action in summary["budget"]["actions"]:
+                st.markdown(f"- {action}")
+        
+        if summary["stopped_early"]:
+            st.markdown(f"**Stopped early:** {summary['stop_reason']}")
 
 # Display final report
 if st.session_state.research_complete:
-    with st.expander("Final Research Report", expanded=True):
+    report_title = "Partial Research Report" if st.session_state.report_partial else "Final Research Report"
+    with st.expander(report_title, expanded=True):
         st.markdown(st.session_state.report)
\ No newline at end of file
@@ -0,0 +1,63 @@
+import pytest
+
+from research.arxiv_index import ArxivIndex
+from research.search_filters import SearchFilters
+
+
+def test_arxiv_query_without_filters_is_plain():
+    assert SearchFilters().arxiv_query("attention") == "all:attention"
+
+
+def test_arxiv_query_categories():
+    assert SearchFilters(categories=["cs.LG"]).arxiv_query("attention") == "all:attention AND cat:cs.LG"
+    # Names without a dot may be a category of their own or a whole archive
+    assert SearchFilters(categories=["quant-ph"]).arxiv_query("qubit") == (
+        "all:qubit AND (cat:quant-ph OR cat:quant-ph.*)"
+    )
+    assert SearchFilters(categories=["cs", "stat.ML"]).arxiv_query("attention") == (
+        "all:attention AND (cat:cs OR cat:cs.* OR cat:stat.ML)"
+    )
+
+
+def test_arxiv_query_field_and_dates():
+    filters = SearchFilters(date_from="2024-01-01", field="title")
+    assert filters.arxiv_query("sparse attention") == (
+        "(ti:sparse AND ti:attention) AND submittedDate:[202401010000 TO 209912312359]"
+    )
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = ArxivIndex(tmp_path / "index.db")
+    index.add_papers([
+        {"arxiv_id": "2101.00001", "title": "Quantum error correction with qubits", "summary": "quantum codes",
+         "authors": ["Alice Quantum"], "categories": ["quant-ph"], "published": "2021-01-05"},
+        {"arxiv_id": "2301.00002", "title": "Quantum-inspired attention", "summary": "quantum attention layers",
+         "authors": ["Bob Learner"], "categories": ["cs.LG", "stat.ML"], "published": "2023-01-10"},
+        {"arxiv_id": "2302.00003", "title": "Quantum field theory notes", "summary": "quantum fields",
+         "authors": ["Carol Physics"], "categories": ["hep-th"], "published": "2023-02-01"},
+    ])
+    yield index
+    index.close()
+
+
+def ids(papers):
+    return sorted(p["arxiv_id"] for p in papers)
+
+
+def test_index_category_filters(index):
+    assert ids(index.search("quantum")) == ["2101.00001", "2301.00002", "2302.00003"]
+    assert ids(index.search("quantum", filters=SearchFilters(categories=["quant-ph"]))) == ["2101.00001"]
+    assert ids(index.search("quantum", filters=SearchFilters(categories=["cs"]))) == ["2301.00002"]
+    assert ids(index.search("quantum", filters=SearchFilters(categories=["stat.ML", "hep-th"]))) == [
+        "2301.00002", "2302.00003"
+    ]
+
+
+def test_index_date_and_field_filters(index):
+    assert ids(index.search("quantum", filters=SearchFilters(date_from="2023-01-01"))) == [
+        "2301.00002", "2302.00003"
+    ]
+    assert ids(index.search("quantum", filters=SearchFilters(date_to="2022-12-31"))) == ["2101.00001"]
+    assert ids(index.search("Learner", filters=SearchFilters(field="author"))) == ["2301.00002"]
+    assert ids(index.search("Learner", filters=SearchFilters(field="title"))) == []
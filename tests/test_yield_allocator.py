@@ -0,0 +1,81 @@
+from research.yield_allocator import YieldAllocator
+
+
+def paper(url, title, summary="", authors=()):
+    return {"url": url, "title": title, "summary": summary, "authors": list(authors)}
+
+
+FLASH = paper(
+    "flash", "FlashAttention: Fast and Memory-Efficient Exact Attention with IO-Awareness",
+    "We propose FlashAttention, an IO-aware exact attention algorithm that uses tiling to reduce "
+    "the number of memory reads and writes between GPU high bandwidth memory and on-chip SRAM.",
+    ["Tri Dao", "Daniel Y. Fu"]
+)
+LONGFORMER = paper(
+    "longformer", "Longformer: The Long-Document Transformer",
+    "We introduce the Longformer with an attention mechanism that scales linearly with sequence length.",
+    ["Iz Beltagy", "Matthew E. Peters"]
+)
+RECIPES = paper("recipes", "A survey of pasta recipes", "Cooking times for dried and fresh pasta.")
+BENGIO = paper(
+    "bengio", "A Neural Probabilistic Language Model",
+    "We learn a distributed representation for words.", ["Yoshua Bengio", "Rejean Ducharme"]
+)
+
+
+def test_score_keeps_long_on_topic_abstracts():
+    allocator = YieldAllocator({})
+    scored = allocator.score(
+        [("memory efficient attention kernels", [FLASH, RECIPES])],
+        "efficient attention mechanisms for long-context transformers",
+        set()
+    )
+    (query, entries), = scored
+    assert [p["url"] for _, p in entries] == ["flash"]
+    assert entries[0][0] >= 0.5
+
+
+def test_score_skips_read_papers_and_assigns_shared_hits_to_best_query():
+    allocator = YieldAllocator({})
+    scored = allocator.score(
+        [("attention transformer", [FLASH, LONGFORMER]), ("memory efficient attention", [FLASH])],
+        "",
+        {"longformer"}
+    )
+    assert [[p["url"] for _, p in entries] for _, entries in scored] == [[], ["flash"]]
+
+
+def test_score_matches_authors_for_author_field():
+    searched = [("Yoshua Bengio", [BENGIO])]
+
+    (_, entries), = YieldAllocator({"search_field": "author"}).score(searched, "", set())
+    assert [p["url"] for _, p in entries] == ["bengio"]
+
+    # Title-only search does not look at the authors
+    (_, entries), = YieldAllocator({"search_field": "title"}).score(searched, "", set())
+    assert entries == []
+
+
+def test_allocate_is_proportional_and_spends_whole_budget():
+    allocator = YieldAllocator({})
+    scored = [
+        ("strong", [(0.9, paper(f"s{i}", "")) for i in range(6)]),
+        ("weak", [(0.3, paper(f"w{i}", "")) for i in range(6)]),
+        ("dead", []),
+    ]
+    allocation = allocator.allocate(scored, budget=8, max_per_query=6)
+
+    counts = {query: len(papers) for query, papers in allocation}
+    assert counts == {"strong": 6, "weak": 2, "dead": 0}
+
+
+def test_allocate_respects_per_query_cap_and_short_pools():
+    allocator = YieldAllocator({})
+    scored = [
+        ("a", [(0.8, paper(f"a{i}", "")) for i in range(10)]),
+        ("b", [(0.5, paper("b0", ""))]),
+    ]
+    allocation = allocator.allocate(scored, budget=9, max_per_query=4)
+
+    assert [len(papers) for _, papers in allocation] == [4, 1]
+    assert [p["url"] for p in allocation[1][1]] == ["b0"]